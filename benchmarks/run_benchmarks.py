@@ -0,0 +1,310 @@
+"""
+Headless benchmarks for the shelf and edge sensor hot paths.
+
+    python benchmarks/run_benchmarks.py -o bench.json
+    python benchmarks/run_benchmarks.py --baseline bench.json
+
+Runs on the offscreen Qt platform with pywin32 replaced by win32_stubs, so
+it works on Linux CI as well as Windows. App data and temp files go to a
+scratch directory that is removed afterwards.
+
+Every case reports per-call times in ms (min/median/mean/max over --repeat
+runs) as JSON. With --baseline, each median is compared against the same
+case in an earlier result file; a case slower by more than --tolerance is
+reported as a regression and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+# Must all happen before the app's modules (or Qt) are imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+SCRATCH = tempfile.mkdtemp(prefix="mfs-bench-")
+os.environ["APPDATA"] = os.path.join(SCRATCH, "appdata")
+os.environ["TEMP"] = os.path.join(SCRATCH, "temp")
+
+import win32_stubs  # noqa: E402
+
+win32_stubs.install()
+
+from PySide6 import QtCore, QtGui, QtWidgets  # noqa: E402
+
+from myfilestation.edge_sensor import EdgeSensorWindow  # noqa: E402
+from myfilestation.drag_tracker import DragSessionTracker  # noqa: E402
+from myfilestation.ingest import file_item  # noqa: E402
+from myfilestation.input_sources import PollingInputSource, ScriptedInputSource  # noqa: E402
+from myfilestation.settings import AppSettings  # noqa: E402
+from myfilestation.shelf_model import THUMB_SIZE  # noqa: E402
+from myfilestation.shelf_window import ShelfWindow  # noqa: E402
+from myfilestation.thumbnails import crop_thumbnail, decode_thumbnail  # noqa: E402
+
+SHELF_SIZES = (100, 1000, 10000)
+
+
+class Case:
+    """
+    One benchmark: setup() and teardown() run untimed around every call of
+    run(). number > 1 calls run() that many times per sample (for
+    microsecond-scale work) and reports the time per call.
+    """
+
+    def __init__(self, name: str, run: Callable[[], None], setup: Optional[Callable[[], None]] = None,
+                 teardown: Optional[Callable[[], None]] = None, number: int = 1) -> None:
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.number = number
+
+    def measure(self, repeat: int) -> Dict[str, float]:
+        samples: List[float] = []
+        for _ in range(repeat):
+            if self.setup is not None:
+                self.setup()
+            run = self.run
+            t0 = time.perf_counter()
+            for _ in range(self.number):
+                run()
+            samples.append((time.perf_counter() - t0) * 1000.0 / self.number)
+            if self.teardown is not None:
+                self.teardown()
+        return {
+            "runs": repeat,
+            "number": self.number,
+            "min_ms": round(min(samples), 4),
+            "median_ms": round(statistics.median(samples), 4),
+            "mean_ms": round(statistics.fmean(samples), 4),
+            "max_ms": round(max(samples), 4),
+        }
+
+
+def drain() -> None:
+    """Let deferred work (sort timers, queued signals) run before moving on."""
+    QtWidgets.QApplication.processEvents()
+
+
+# -------- fixtures --------
+def make_files(directory: str, count: int) -> List[str]:
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        p = os.path.join(directory, f"file_{i:05d}.txt")
+        with open(p, "wb") as f:
+            f.write(b"x" * (i % 4096))
+        paths.append(p)
+    return paths
+
+
+def make_image(path: str, width: int, height: int) -> str:
+    """A photo-like image (gradient plus shapes) so decoding has real work to do."""
+    img = QtGui.QImage(width, height, QtGui.QImage.Format_RGB32)
+    painter = QtGui.QPainter(img)
+    grad = QtGui.QLinearGradient(0, 0, width, height)
+    grad.setColorAt(0.0, QtGui.QColor(30, 80, 160))
+    grad.setColorAt(1.0, QtGui.QColor(240, 180, 60))
+    painter.fillRect(img.rect(), QtGui.QBrush(grad))
+    for i in range(200):
+        painter.setBrush(QtGui.QColor((i * 37) % 256, (i * 91) % 256, (i * 53) % 256))
+        painter.drawEllipse((i * 7919) % width, (i * 104729) % height, width // 20, height // 20)
+    painter.end()
+    img.save(path, None, 90)
+    return path
+
+
+# -------- cases --------
+def shelf_cases(shelf: ShelfWindow, files: List[str]) -> List[Case]:
+    cases = []
+    pending: List[list] = []
+
+    def reset() -> None:
+        shelf.force_remove_items(list(shelf.items))
+        drain()
+
+    for n in SHELF_SIZES:
+        label = f"{n // 1000}k" if n >= 1000 else str(n)
+
+        def prepare(n=n) -> None:
+            pending[:] = [[file_item(p) for p in files[:n]]]
+
+        def add() -> None:
+            # What a drop or ingest batch costs on the GUI thread
+            shelf._append_items(pending[0])
+            drain()
+
+        cases.append(Case(f"shelf.add_{label}", add, setup=prepare, teardown=reset))
+
+        def fill(n=n) -> None:
+            shelf._append_items([file_item(p) for p in files[:n]])
+            drain()
+
+        def clear() -> None:
+            shelf.clear_unlocked()
+            drain()
+
+        cases.append(Case(f"shelf.clear_unlocked_{label}", clear, setup=fill, teardown=reset))
+
+    text = "\n".join(f"line {i}: the quick brown fox jumps over the lazy dog" for i in range(2000))
+    screenshot = QtGui.QImage(os.path.join(SCRATCH, "screenshot.png"))
+    clipboard = QtGui.QGuiApplication.clipboard()
+
+    def import_clipboard() -> None:
+        shelf.import_from_clipboard()
+        drain()
+
+    cases.append(Case("clipboard.import_text_100k", import_clipboard,
+                      setup=lambda: (clipboard.setText(text), drain()), teardown=reset))
+    cases.append(Case("clipboard.import_image_1080p", import_clipboard,
+                      setup=lambda: (clipboard.setImage(screenshot), drain()), teardown=reset))
+    return cases
+
+
+def thumbnail_cases() -> List[Case]:
+    jpeg = os.path.join(SCRATCH, "photo_24mp.jpg")
+    png = os.path.join(SCRATCH, "render_12mp.png")
+    in_memory = QtGui.QImage(png)
+    return [
+        Case("thumbnail.decode_jpeg_24mp", lambda: decode_thumbnail(jpeg, THUMB_SIZE)),
+        Case("thumbnail.decode_png_12mp", lambda: decode_thumbnail(png, THUMB_SIZE)),
+        Case("thumbnail.crop_in_memory_12mp", lambda: crop_thumbnail(in_memory, THUMB_SIZE)),
+    ]
+
+
+def sensor_cases(settings: AppSettings) -> List[Case]:
+    source = ScriptedInputSource()
+    tracker = DragSessionTracker(settings, source)
+    sensor = EdgeSensorWindow(settings, tracker)
+
+    # A drag in progress, well away from the dock edge, so it never triggers
+    screen = QtGui.QGuiApplication.primaryScreen().availableGeometry()
+    y = screen.center().y()
+    x0 = screen.left() + screen.width() // 4
+    source.press(x0, y)
+    source.move(x0 + 50, y)
+    steps = [0]
+
+    def tick() -> None:
+        steps[0] = (steps[0] + 1) % 64
+        source.move(x0 + 50 + steps[0], y)
+
+    def uncached() -> None:
+        sensor.class_cache.ttl = 0.0
+
+    def cached() -> None:
+        sensor.class_cache.ttl = 3600.0
+
+    polling = PollingInputSource()
+    polling.set_interval_policy(sensor._poll_interval)
+
+    return [
+        Case("sensor.drag_tick_cached", tick, setup=cached, number=2000),
+        Case("sensor.drag_tick_uncached", tick, setup=uncached, number=2000),
+        Case("sensor.poll_tick_idle", polling._poll, number=2000),
+    ]
+
+
+# -------- reporting --------
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Add a "baseline" block to each result; returns names of regressed cases."""
+    regressed = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = res["median_ms"] / base["median_ms"] if base["median_ms"] > 0 else 1.0
+        res["baseline"] = {
+            "median_ms": base["median_ms"],
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1.0 + tolerance,
+        }
+        if res["baseline"]["regressed"]:
+            regressed.append(name)
+    return regressed
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    for name, res in results.items():
+        line = f"{name:34} {res['median_ms']:>11.4f} ms  (min {res['min_ms']:.4f})"
+        base = res.get("baseline")
+        if base:
+            flag = "  REGRESSED" if base["regressed"] else ""
+            line += f"  x{base['ratio']:.2f} vs {base['median_ms']:.4f}{flag}"
+        print(line, file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown of a median vs the baseline (default 0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per case (default 7)")
+    parser.add_argument("-k", "--filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    try:
+        files = make_files(os.path.join(SCRATCH, "files"), max(SHELF_SIZES))
+        make_image(os.path.join(SCRATCH, "photo_24mp.jpg"), 6000, 4000)
+        make_image(os.path.join(SCRATCH, "render_12mp.png"), 4000, 3000)
+        make_image(os.path.join(SCRATCH, "screenshot.png"), 1920, 1080)
+
+        settings = AppSettings()
+        settings.drag_delay_ms = 0
+        shelf = ShelfWindow(settings)
+        drain()
+
+        cases = shelf_cases(shelf, files) + thumbnail_cases() + sensor_cases(settings)
+        results: Dict[str, dict] = {}
+        for case in cases:
+            if args.filter in case.name:
+                results[case.name] = case.measure(args.repeat)
+
+        regressed: List[str] = []
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressed = compare(results, json.load(f).get("results", {}), args.tolerance)
+        print_table(results)
+
+        report = {
+            "meta": {
+                "taken": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "qt": QtCore.qVersion(),
+                "platform": f"{platform.system()} {platform.machine()} ({app.platformName()})",
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        if regressed:
+            report["regressed"] = regressed
+        out = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(out + "\n")
+        else:
+            print(out)
+
+        if regressed:
+            print(f"{len(regressed)} case(s) slower than baseline by more than "
+                  f"{args.tolerance:.0%}: {', '.join(regressed)}", file=sys.stderr)
+            return 1
+        return 0
+    finally:
+        # No exec(), so run the app's shutdown hooks (session writer, workers) ourselves
+        app.aboutToQuit.emit()
+        shutil.rmtree(SCRATCH, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
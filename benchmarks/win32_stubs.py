@@ -0,0 +1,57 @@
+"""
+Stand-ins for the pywin32 modules the app imports, for benchmark runs only.
+
+The fake desktop is a single Explorer window: every cursor position is over
+its file view, whose parent chain ends at a CabinetWClass frame. That puts
+the edge sensor on its full classification path, with no OS calls in the
+measurement, so numbers compare across machines and platforms.
+"""
+
+import sys
+import types
+
+# hwnd -> (class name, parent hwnd)
+WINDOWS = {
+    1: ("CabinetWClass", 0),
+    2: ("ShellTabWindowClass", 1),
+    3: ("DUIViewWndClassName", 2),
+    4: ("DirectUIHWND", 3),
+    5: ("SHELLDLL_DefView", 4),
+    6: ("DirectUIHWND", 5),
+}
+VIEW_HWND = 6
+ROOT_HWND = 1
+
+cursor = [0, 0]
+left_button_down = False
+
+
+def _get_async_key_state(vk: int) -> int:
+    return 0x8000 if left_button_down else 0
+
+
+def _get_class_name(hwnd: int) -> str:
+    return WINDOWS[hwnd][0]
+
+
+def _get_parent(hwnd: int) -> int:
+    return WINDOWS.get(hwnd, ("", 0))[1]
+
+
+def install() -> None:
+    """Register win32api, win32con and win32gui in sys.modules."""
+    win32con = types.ModuleType("win32con")
+    win32con.VK_LBUTTON = 0x01
+    win32con.GA_ROOT = 2
+
+    win32api = types.ModuleType("win32api")
+    win32api.GetAsyncKeyState = _get_async_key_state
+
+    win32gui = types.ModuleType("win32gui")
+    win32gui.GetCursorPos = lambda: tuple(cursor)
+    win32gui.WindowFromPoint = lambda pt: VIEW_HWND
+    win32gui.GetAncestor = lambda hwnd, flags: ROOT_HWND
+    win32gui.GetClassName = _get_class_name
+    win32gui.GetParent = _get_parent
+
+    sys.modules.update(win32con=win32con, win32api=win32api, win32gui=win32gui)
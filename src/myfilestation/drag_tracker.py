@@ -0,0 +1,123 @@
+import time
+from typing import Optional
+
+from PySide6 import QtCore, QtGui
+
+from .input_sources import InputSource, create_input_source
+
+
+class DragSessionTracker(QtCore.QObject):
+    """
+    Turns raw button/move events from an InputSource into drag sessions.
+
+    A press becomes a drag once the cursor moved drag_dist px and the button
+    was held drag_delay_ms. On release the session ends with drag_ended if
+    someone claimed the drop (mark_dropped), else with drag_cancelled.
+    Presses that never became a drag end silently.
+
+    The low-level button-up usually arrives before the OLE drop is delivered,
+    so a release without a drop waits DROP_GRACE_MS for mark_dropped before
+    it is reported as cancelled.
+    """
+
+    DROP_GRACE_MS = 250
+
+    drag_started = QtCore.Signal(QtCore.QPoint)
+    drag_moved = QtCore.Signal(QtCore.QPoint)
+    drag_ended = QtCore.Signal(QtCore.QPoint)
+    drag_cancelled = QtCore.Signal(QtCore.QPoint)
+
+    def __init__(self, settings, source: Optional[InputSource] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.settings = settings
+
+        self._dragging = False
+        self._dropped = False
+        self._down_pos: Optional[QtCore.QPoint] = None
+        self._down_t = 0.0
+
+        # Re-check once drag_delay_ms has passed, in case the cursor stopped
+        self._delay_timer = QtCore.QTimer(self)
+        self._delay_timer.setSingleShot(True)
+        self._delay_timer.timeout.connect(self._recheck)
+
+        # Pending drag_cancelled of a release whose drop may still be on its way
+        self._release_pos = QtCore.QPoint()
+        self._cancel_timer = QtCore.QTimer(self)
+        self._cancel_timer.setSingleShot(True)
+        self._cancel_timer.setInterval(self.DROP_GRACE_MS)
+        self._cancel_timer.timeout.connect(self._cancel_now)
+
+        self.source = source if source is not None else create_input_source(settings.input_backend, self)
+        self.source.button_changed.connect(self._on_button)
+        self.source.moved.connect(self._on_move)
+
+    def start(self) -> None:
+        self.source.start()
+
+    def stop(self) -> None:
+        self.source.stop()
+        self._cancel_timer.stop()
+        self._reset()
+
+    def is_dragging(self) -> bool:
+        return self._dragging
+
+    def mark_dropped(self) -> None:
+        """Called by a drop target so the release reports drag_ended."""
+        if self._down_pos is not None:
+            self._dropped = True
+        elif self._cancel_timer.isActive():
+            # The drop landed just after the release
+            self._cancel_timer.stop()
+            self.drag_ended.emit(self._release_pos)
+
+    def _reset(self) -> None:
+        self._delay_timer.stop()
+        self._down_pos = None
+        self._dragging = False
+        self._dropped = False
+
+    def _cancel_now(self) -> None:
+        self._cancel_timer.stop()
+        self.drag_cancelled.emit(self._release_pos)
+
+    def _on_button(self, down: bool, gpos: QtCore.QPoint) -> None:
+        was_dragging = self._dragging
+        dropped = self._dropped
+        self._reset()
+        if self._cancel_timer.isActive():
+            # A new press: the previous drag is over, drop or not
+            self._cancel_now()
+
+        if down:
+            self._down_pos = gpos
+            self._down_t = time.time()
+        elif was_dragging:
+            if dropped:
+                self.drag_ended.emit(gpos)
+            else:
+                self._release_pos = QtCore.QPoint(gpos)
+                self._cancel_timer.start()
+
+    def _recheck(self) -> None:
+        if self.source.is_left_down():
+            self._on_move(QtGui.QCursor.pos())
+
+    def _on_move(self, gpos: QtCore.QPoint) -> None:
+        if self._down_pos is None:
+            return
+
+        if not self._dragging:
+            dx = abs(gpos.x() - self._down_pos.x())
+            dy = abs(gpos.y() - self._down_pos.y())
+            if (dx + dy) < self.settings.drag_dist:
+                return
+            held_ms = (time.time() - self._down_t) * 1000.0
+            if held_ms < self.settings.drag_delay_ms:
+                self._delay_timer.start(int(self.settings.drag_delay_ms - held_ms) + 1)
+                return
+            self._dragging = True
+            self.drag_started.emit(gpos)
+
+        self.drag_moved.emit(gpos)
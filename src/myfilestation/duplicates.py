@@ -0,0 +1,123 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PySide6 import QtCore
+
+
+def path_key(path: str) -> str:
+    """
+    Normalized, case-insensitive form of a path, used to spot the same file
+    dropped twice. Pure string work: no filesystem access.
+    """
+    return os.path.normcase(os.path.abspath(path)).casefold()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024, limit: int = -1,
+              cancel: Optional[threading.Event] = None) -> Optional[str]:
+    """
+    blake2b of a file read chunk_size bytes at a time, so memory stays flat
+    no matter how big the file is. limit >= 0 hashes only that many leading
+    bytes. Returns None if the file can't be read or the hash was cancelled.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    remaining = limit
+    try:
+        with open(path, "rb") as f:
+            while remaining != 0:
+                if cancel is not None and cancel.is_set():
+                    return None
+                n = chunk_size if remaining < 0 else min(chunk_size, remaining)
+                buf = f.read(n)
+                if not buf:
+                    break
+                h.update(buf)
+                if remaining > 0:
+                    remaining -= len(buf)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class DuplicateScanner(QtCore.QObject):
+    """
+    Finds shelf files with identical content at different paths.
+
+    Runs on a single background thread. Files are grouped by size first, then
+    by a hash of their first 64 KiB, and only files still tied after that get
+    a full streamed hash. Hashes are remembered per (path, size, mtime), so
+    rescanning after a drop only reads the new files.
+    """
+
+    # List[List[item_id]], each group sharing one content, in shelf order
+    found = QtCore.Signal(object)
+
+    PREFIX_BYTES = 64 * 1024
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mfs-dupes")
+        self._cancel = threading.Event()
+        self._hashes: Dict[Tuple[str, int, int, int], str] = {}
+
+    def scan(self, entries: Sequence[Tuple[str, str]]) -> None:
+        """entries: (item_id, path) of the shelf's files; supersedes any running scan."""
+        self._cancel.set()
+        self._cancel = threading.Event()
+        self._executor.submit(self._scan, list(entries), self._cancel)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def shutdown(self) -> None:
+        self._cancel.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _hash(self, path: str, st: os.stat_result, limit: int, cancel: threading.Event) -> Optional[str]:
+        key = (path, st.st_size, st.st_mtime_ns, limit)
+        h = self._hashes.get(key)
+        if h is None:
+            h = hash_file(path, limit=limit, cancel=cancel)
+            if h is not None:
+                self._hashes[key] = h
+        return h
+
+    def _scan(self, entries: List[Tuple[str, str]], cancel: threading.Event) -> None:
+        # Forget files that left the shelf
+        live = {path for _, path in entries}
+        self._hashes = {k: v for k, v in self._hashes.items() if k[0] in live}
+
+        by_size: Dict[int, List[Tuple[str, str, os.stat_result]]] = {}
+        for item_id, path in entries:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # Empty files are trivially equal and not worth flagging
+            if st.st_size:
+                by_size.setdefault(st.st_size, []).append((item_id, path, st))
+
+        groups: List[List[str]] = []
+        for size, candidates in by_size.items():
+            # Files that fit in the prefix go straight to the full hash
+            for limit in ((self.PREFIX_BYTES, -1) if size > self.PREFIX_BYTES else (-1,)):
+                if len(candidates) < 2:
+                    break
+                buckets: Dict[str, list] = {}
+                for c in candidates:
+                    if cancel.is_set():
+                        return
+                    h = self._hash(c[1], c[2], limit, cancel)
+                    if h is not None:
+                        buckets.setdefault(h, []).append(c)
+                candidates = [c for b in buckets.values() if len(b) > 1 for c in b]
+            else:
+                tied: Dict[str, List[str]] = {}
+                for c in candidates:
+                    tied.setdefault(self._hashes[(c[1], c[2].st_size, c[2].st_mtime_ns, -1)], []).append(c[0])
+                groups.extend(tied.values())
+
+        if not cancel.is_set():
+            self.found.emit(groups)
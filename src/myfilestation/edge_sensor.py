@@ -1,10 +1,54 @@
 import time
-from PySide6 import QtCore, QtGui
+from typing import Dict, Optional, Tuple
+
+from PySide6 import QtCore
 
-import win32api
 import win32con
 import win32gui
 
+from . import metrics
+from .drag_tracker import DragSessionTracker
+from .screens import screen_geometry
+
+
+# Window classes that make up Explorer / desktop file views
+VIEW_CLASSES = frozenset({"DirectUIHWND", "SysListView32", "SHELLDLL_DefView"})
+EXPLORER_FRAMES = frozenset({"CabinetWClass", "ExploreWClass"})
+DESKTOP_FRAMES = frozenset({"Progman", "WorkerW"})
+FILE_VIEW_FRAMES = EXPLORER_FRAMES | DESKTOP_FRAMES
+
+
+class WindowClassCache:
+    """
+    hwnd -> "is a file view" results with a short TTL.
+
+    Handles can be recycled once a window closes, so entries expire instead
+    of living forever; the TTL is far shorter than any window's lifetime.
+    """
+
+    def __init__(self, ttl: float = 0.5, max_entries: int = 64) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[int, Tuple[float, bool]] = {}
+
+    def get(self, hwnd: int, now: float) -> Optional[bool]:
+        entry = self._entries.get(hwnd)
+        if entry is not None and now - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, hwnd: int, value: bool, now: float) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[hwnd] = (now, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 class EdgeSensorWindow(QtCore.QObject):
     """
@@ -15,53 +59,67 @@ class EdgeSensorWindow(QtCore.QObject):
       - Mouse moved enough (drag)
       - Cursor is over an Explorer/desktop file view (avoid dragging app windows)
       - Cursor near the configured dock edge
+
+    Drag sessions come from a DragSessionTracker (shared with the shelf); with
+    the default hook backend the sensor does no work between mouse events.
     """
 
     supported_drag_detected = QtCore.Signal(object)  # emits None
 
-    def __init__(self, settings):
+    def __init__(self, settings, tracker: Optional[DragSessionTracker] = None):
         super().__init__()
         self.settings = settings
 
-        self.edge_threshold = 48   # px near screen edge
-        self.drag_dist = 12        # pixels moved to treat as drag
-        self.drag_delay_ms = 60    # held time before treat as drag
+        self.edge_threshold = settings.edge_threshold
 
         self._active = True
-        self._dragging = False
         self._triggered = False
-        self._down_pos = None
-        self._down_t = 0.0
 
-        self._timer = QtCore.QTimer(self)
-        self._timer.setInterval(16)  # ~60fps
-        self._timer.timeout.connect(self._tick)
-        self._timer.start()
+        # Number of mouse events the sensor handled (idle cost check)
+        self.wakeups = 0
+
+        self.screens = screen_geometry()
+
+        # hwnd classification; hits/misses show how often we skip win32 calls
+        self.class_cache = WindowClassCache()
+
+        self.tracker = tracker if tracker is not None else DragSessionTracker(settings, parent=self)
+        self.tracker.drag_started.connect(self._on_drag_started)
+        self.tracker.drag_moved.connect(self._on_drag_moved)
+        # Used by the polling backend, and by the hook's polling fallback
+        self.tracker.source.set_interval_policy(self._poll_interval)
+        self.tracker.start()
 
     # kept for compatibility with TrayController
     def suspend(self) -> None:
         self._active = False
+        self.tracker.stop()
 
     def resume(self) -> None:
         self._active = True
+        self.tracker.start()
 
     def reposition(self) -> None:
         return
 
-    def _near_edge(self, gpos: QtCore.QPoint) -> bool:
-        screen = QtGui.QGuiApplication.screenAt(gpos)
-        if not screen:
-            screen = QtGui.QGuiApplication.primaryScreen()
-        if not screen:
-            return False
+    def _edge_distance(self, gpos: QtCore.QPoint) -> int:
+        """Horizontal distance in px from gpos to the dock edge of its screen."""
+        return self.screens.edge_distance(gpos, self.settings.dock_side)
 
-        r = screen.availableGeometry()
-        x = gpos.x()
+    def _near_edge(self, gpos: QtCore.QPoint) -> bool:
+        return self._edge_distance(gpos) <= self.edge_threshold
 
-        if self.settings.dock_side == "left":
-            return x <= (r.x() + self.edge_threshold)
-        else:
-            return x >= (r.x() + r.width() - self.edge_threshold)
+    def _poll_interval(self, down: bool, still_polls: int, gpos: QtCore.QPoint) -> int:
+        """
+        Adaptive schedule for the polling backend: slow while idle, 60 Hz once
+        the button is down, faster still when a drag closes in on the edge.
+        """
+        s = self.settings
+        if not down:
+            return s.poll_idle_ms if still_polls >= 2 else s.poll_moving_ms
+        if self.tracker.is_dragging() and self._edge_distance(gpos) <= s.edge_boost_px:
+            return s.poll_edge_ms
+        return s.poll_drag_ms
 
     def _window_class_chain(self, hwnd: int, max_depth: int = 10):
         chain = []
@@ -87,60 +145,40 @@ class EdgeSensorWindow(QtCore.QObject):
         if not hwnd:
             return False
 
-        chain = self._window_class_chain(hwnd)
+        now = time.monotonic()
+        cached = self.class_cache.get(hwnd, now)
+        if cached is not None:
+            metrics.inc("sensor.class_cache_hit")
+            return cached
+        metrics.inc("sensor.class_cache_miss")
+
+        result = self._classify_window(hwnd)
+        self.class_cache.put(hwnd, result, now)
+        return result
+
+    def _classify_window(self, hwnd: int) -> bool:
         top = win32gui.GetAncestor(hwnd, win32con.GA_ROOT)
         try:
             top_cls = win32gui.GetClassName(top)
         except Exception:
             top_cls = ""
+        if top_cls not in FILE_VIEW_FRAMES:
+            return False
 
-        view_classes = {"DirectUIHWND", "SysListView32", "SHELLDLL_DefView"}
-        explorer_frames = {"CabinetWClass", "ExploreWClass"}
-        desktop_frames = {"Progman", "WorkerW"}
-
-        has_view = any(c in view_classes for c in chain)
-        is_explorer = top_cls in explorer_frames
-        is_desktop = top_cls in desktop_frames
-
-        return has_view and (is_explorer or is_desktop)
-
-    def _tick(self) -> None:
-        if not self._active:
-            return
-
-        ldown = (win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000) != 0
-        gpos = QtGui.QCursor.pos()
-
-        if ldown and self._down_pos is None:
-            self._down_pos = gpos
-            self._down_t = time.time()
-            self._dragging = False
-            self._triggered = False
-            return
-
-        if (not ldown) and self._down_pos is not None:
-            self._down_pos = None
-            self._dragging = False
-            self._triggered = False
-            return
-
-        if not ldown or self._down_pos is None:
-            return
-
-        dx = abs(gpos.x() - self._down_pos.x())
-        dy = abs(gpos.y() - self._down_pos.y())
-        moved = (dx + dy) >= self.drag_dist
-        held_ms = (time.time() - self._down_t) * 1000.0
+        return any(c in VIEW_CLASSES for c in self._window_class_chain(hwnd))
 
-        if (not self._dragging) and moved and (held_ms >= self.drag_delay_ms):
-            self._dragging = True
+    def _on_drag_started(self, gpos: QtCore.QPoint) -> None:
+        self._triggered = False
 
-        if not self._dragging:
+    @metrics.timed("sensor.drag_move")
+    def _on_drag_moved(self, gpos: QtCore.QPoint) -> None:
+        self.wakeups += 1
+        if not self._active or self._triggered:
             return
 
         if not self._is_file_view_under_cursor():
             return
 
-        if (not self._triggered) and self._near_edge(gpos):
+        if self._near_edge(gpos):
             self._triggered = True
             self.supported_drag_detected.emit(None)
@@ -0,0 +1,277 @@
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6 import QtCore
+
+
+class FileState:
+    """What the watcher last saw of one shelved file."""
+
+    __slots__ = ("exists", "size", "mtime", "is_dir")
+
+    def __init__(self, exists: bool, size: int = 0, mtime: float = 0.0, is_dir: bool = False) -> None:
+        self.exists = exists
+        self.size = size
+        self.mtime = mtime
+        self.is_dir = is_dir
+
+
+# normcase(name) -> (size, mtime_ns, on-disk name, is_dir) of the entries in one directory
+_Listing = Dict[str, Tuple[int, int, str, bool]]
+
+
+class FileWatcher(QtCore.QObject):
+    """
+    Existence and metadata cache for shelved files.
+
+    Watches the parent directories of items with QFileSystemWatcher and
+    relists a directory on a background thread when it changes, so
+    exists()/state() never touch the disk. One scandir per directory yields
+    the metadata of all items in it at once. A file that vanished while a new
+    one with the same size and mtime appeared in the same directory is
+    reported as moved (a rename). Directories that can't be watched, as
+    happens on some network shares, are relisted every poll_ms instead.
+
+    Nothing on the GUI thread waits on the disk: items are registered
+    WATCH_CHUNK per event-loop turn, and a directory is only handed to
+    QFileSystemWatcher once a background listing has shown it is reachable.
+    """
+
+    WATCH_CHUNK = 500
+
+    changed = QtCore.Signal(object)     # List[item_id] whose state changed
+    moved = QtCore.Signal(str, str)     # item_id, new path
+    _listed = QtCore.Signal(str, object)  # directory, Optional[_Listing]
+
+    def __init__(self, poll_ms: int = 30000, parent=None) -> None:
+        super().__init__(parent)
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mfs-fswatch")
+
+        self._where: Dict[str, Tuple[str, str]] = {}  # item id -> (directory, name)
+        self._ids_by_dir: Dict[str, Dict[str, Set[str]]] = {}  # dir -> name -> item ids
+        self._listings: Dict[str, _Listing] = {}
+        self._states: Dict[str, FileState] = {}
+        self._unwatchable: Set[str] = set()
+        self._in_flight: Set[str] = set()
+        self._dirty: Set[str] = set()
+        # Directories QFileSystemWatcher has accepted
+        self._watched_dirs: Set[str] = set()
+
+        # item id -> path, waiting to be registered (oldest first)
+        self._queued: Dict[str, str] = {}
+        self._chunk_timer = QtCore.QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.setInterval(0)
+        self._chunk_timer.timeout.connect(self._drain)
+
+        self._listed.connect(self._on_listed)
+
+        # Coalesces bursts of change notifications into one relist per directory
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(100)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(poll_ms)
+        self._poll_timer.timeout.connect(self._poll_unwatchable)
+        self._poll_timer.start()
+
+    # -------- public API --------
+    def watch(self, item_id: str, path: str) -> None:
+        self.watch_many([(item_id, path)])
+
+    def watch_many(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """
+        Watch (item_id, path) pairs, the first WATCH_CHUNK right away and the
+        rest on later event-loop turns. Items in a directory that is already
+        listed get their state as they are registered, one changed signal per
+        chunk.
+        """
+        queued = self._queued
+        for item_id, path in entries:
+            # A newer path for the same item replaces the queued one
+            queued.pop(item_id, None)
+            queued[item_id] = path
+        if queued and not self._chunk_timer.isActive():
+            self._drain()
+
+    def _drain(self) -> None:
+        batch = list(itertools.islice(self._queued.items(), self.WATCH_CHUNK))
+        for item_id, _ in batch:
+            del self._queued[item_id]
+        if self._queued:
+            self._chunk_timer.start()
+        known = [item_id for item_id, path in batch if self._watch_one(item_id, path)]
+        if known:
+            self.changed.emit(known)
+
+    def _watch_one(self, item_id: str, path: str) -> bool:
+        """True if the state came from a cached listing, False if one is pending."""
+        self.unwatch(item_id)
+        d, name = os.path.split(os.path.abspath(path))
+        self._where[item_id] = (d, name)
+        ids = self._ids_by_dir.get(d)
+        if ids is None:
+            # Handed to the watcher by _on_listed, once the listing got through
+            ids = self._ids_by_dir[d] = {}
+        # Deduplicated temp items can share one file
+        ids.setdefault(name, set()).add(item_id)
+
+        listing = self._listings.get(d)
+        if listing is None:
+            self._schedule(d)
+            return False
+        self._states[item_id] = self._state_from(listing, name)
+        return True
+
+    def unwatch(self, item_id: str) -> None:
+        self._queued.pop(item_id, None)
+        where = self._where.pop(item_id, None)
+        if where is None:
+            return
+        self._states.pop(item_id, None)
+        d, name = where
+        ids = self._ids_by_dir.get(d)
+        if ids is None:
+            return
+        same = ids.get(name)
+        if same is not None:
+            same.discard(item_id)
+            if not same:
+                del ids[name]
+        if not ids:
+            del self._ids_by_dir[d]
+            self._listings.pop(d, None)
+            self._dirty.discard(d)
+            self._unwatchable.discard(d)
+            if d in self._watched_dirs:
+                self._watched_dirs.discard(d)
+                self._watcher.removePath(d)
+
+    def exists(self, item_id: str) -> bool:
+        """Last known existence; optimistic until the first listing arrives."""
+        st = self._states.get(item_id)
+        return st is None or st.exists
+
+    def state(self, item_id: str) -> Optional[FileState]:
+        return self._states.get(item_id)
+
+    def refresh(self) -> None:
+        """Relist every watched directory, e.g. after resuming from sleep."""
+        for d in self._ids_by_dir:
+            self._schedule(d)
+
+    def shutdown(self) -> None:
+        self._chunk_timer.stop()
+        self._poll_timer.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------- internals --------
+    @staticmethod
+    def _state_from(listing: _Listing, name: str) -> FileState:
+        entry = listing.get(os.path.normcase(name))
+        if entry is None:
+            return FileState(False)
+        return FileState(True, entry[0], entry[1] / 1e9, entry[3])
+
+    @staticmethod
+    def _list_dir(d: str) -> Optional[_Listing]:
+        listing: _Listing = {}
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    # On Windows both come from the directory read itself: no extra I/O
+                    try:
+                        st = e.stat()
+                        is_dir = e.is_dir()
+                    except OSError:
+                        continue
+                    listing[os.path.normcase(e.name)] = (st.st_size, st.st_mtime_ns, e.name, is_dir)
+        except OSError:
+            return None
+        return listing
+
+    def _schedule(self, d: str) -> None:
+        self._dirty.add(d)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self) -> None:
+        for d in list(self._dirty):
+            if d in self._in_flight:
+                continue  # relisted again when the running one lands
+            self._dirty.discard(d)
+            self._in_flight.add(d)
+            self._executor.submit(lambda d=d: self._listed.emit(d, self._list_dir(d)))
+
+    def _poll_unwatchable(self) -> None:
+        for d in self._unwatchable:
+            self._schedule(d)
+
+    def _on_listed(self, d: str, listing: Optional[_Listing]) -> None:
+        self._in_flight.discard(d)
+        if self._dirty:
+            self._flush_timer.start()
+
+        ids = self._ids_by_dir.get(d)
+        if ids is None:
+            return
+
+        if d not in self._unwatchable and (listing is None or d not in self._watcher.directories()):
+            # First listing of d, or it was deleted (and maybe recreated),
+            # which drops it from the watcher
+            self._watched_dirs.discard(d)
+            if listing is not None and self._watcher.addPath(d):
+                self._watched_dirs.add(d)
+                # Catch what changed between the listing and the watch
+                self._schedule(d)
+            else:
+                # Gone, unreachable or not watchable: poll it
+                self._unwatchable.add(d)
+        if listing is None:
+            listing = {}
+
+        old = self._listings.get(d)
+        self._listings[d] = listing
+
+        changed: List[str] = []
+        vanished: List[Tuple[str, str]] = []
+        for name, same in ids.items():
+            st = self._state_from(listing, name)
+            for item_id in same:
+                prev = self._states.get(item_id)
+                self._states[item_id] = st
+                if prev is None or (prev.exists, prev.size, prev.mtime) != (st.exists, st.size, st.mtime):
+                    changed.append(item_id)
+                if not st.exists and prev is not None and prev.exists:
+                    vanished.append((name, item_id))
+
+        if vanished and old is not None:
+            # Files that just appeared and aren't on the shelf yet
+            claimed = {os.path.normcase(n) for n in ids}
+            fresh = {
+                meta[:2]: meta[2] for key, meta in listing.items()
+                if key not in old and key not in claimed
+            }
+            renamed: Dict[str, str] = {}
+            for name, item_id in vanished:
+                if name not in renamed:
+                    prev_meta = old.get(os.path.normcase(name))
+                    new_name = fresh.pop(prev_meta[:2], None) if prev_meta is not None else None
+                    if new_name is None:
+                        continue
+                    renamed[name] = new_name
+                self._rename(os.path.join(d, renamed[name]), item_id)
+
+        if changed:
+            self.changed.emit(changed)
+
+    def _rename(self, new_path: str, item_id: str) -> None:
+        self.watch(item_id, new_path)
+        self.moved.emit(item_id, new_path)
+
@@ -0,0 +1,97 @@
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+from . import metrics
+from .temp_store import ContentStore
+
+
+@dataclass
+class EncodeResult:
+    path: str
+    encode_ms: float
+    encoded_bytes: int
+
+
+def encoder_params(fmt: str, png_compression: int) -> Tuple[str, int]:
+    """Map the temp_image_format / png_compression settings to (Qt format, quality)."""
+    fmt = (fmt or "png").lower()
+    if fmt == "webp":
+        supported = {bytes(f).decode().lower() for f in QtGui.QImageWriter.supportedImageFormats()}
+        if "webp" in supported:
+            return "WEBP", 100  # quality 100 selects lossless WebP
+        fmt = "png"
+    if fmt == "bmp":
+        return "BMP", -1
+    # Qt's PNG writer derives the zlib level from quality: 100 -> 0, 0 -> 9
+    level = max(0, min(9, png_compression))
+    return "PNG", 100 - round(level * 100 / 9)
+
+
+class ImageEncoder(QtCore.QObject):
+    """
+    Writes in-memory images into the ContentStore on a single background thread.
+
+    submit() is idempotent per item, so a prefetch started on selection and a
+    drag-out that needs the file now share one encode; the latter just waits
+    on the returned Future.
+    """
+
+    encoded = QtCore.Signal(str, object)  # item_id, Optional[EncodeResult]
+
+    def __init__(self, settings, store: ContentStore, parent=None) -> None:
+        super().__init__(parent)
+        self.settings = settings
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mfs-encode")
+        self._futures: Dict[str, Future] = {}
+
+    def submit(self, item_id: str, qimage: QtGui.QImage) -> Future:
+        fut = self._futures.get(item_id)
+        if fut is not None and not fut.cancelled():
+            return fut
+
+        fmt, quality = encoder_params(self.settings.temp_image_format, self.settings.png_compression)
+        fut = self._executor.submit(self._encode, item_id, qimage, fmt, quality)
+        self._futures[item_id] = fut
+        fut.add_done_callback(lambda f: self._done(item_id, f))
+        return fut
+
+    def cancel(self, item_id: str) -> None:
+        fut = self._futures.pop(item_id, None)
+        if fut is not None:
+            fut.cancel()
+
+    def forget(self, item_id: str) -> None:
+        """Drop the finished future of an item whose result has been applied."""
+        self._futures.pop(item_id, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _encode(self, item_id: str, qimage: QtGui.QImage, fmt: str, quality: int) -> Optional[EncodeResult]:
+        t0 = time.perf_counter()
+        p, encoded = self.store.put_image(item_id, qimage, fmt, quality)
+        if not p:
+            return None
+        ms = (time.perf_counter() - t0) * 1000.0
+        metrics.observe("image.encode" if encoded else "image.dedupe_hit", ms)
+        try:
+            nbytes = os.path.getsize(p)
+        except OSError:
+            nbytes = 0
+        return EncodeResult(p, ms, nbytes)
+
+    def _done(self, item_id: str, fut: Future) -> None:
+        # Runs on the worker thread; the signal hops to the GUI thread
+        if fut.cancelled():
+            return
+        try:
+            result = fut.result()
+        except Exception:
+            result = None
+        self.encoded.emit(item_id, result)
@@ -0,0 +1,160 @@
+import fnmatch
+import os
+import threading
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from PySide6 import QtCore
+
+from .metadata import describe_kind
+from .models import StationItem, ItemType
+from .utils import is_image_file
+
+
+def file_item(path: str) -> StationItem:
+    thumb = path if is_image_file(path) else None
+    item = StationItem.new(ItemType.FILE, path, os.path.basename(path), thumb)
+    # Good enough until the watcher reports size, mtime and whether it's a folder
+    item.kind = describe_kind(item)
+    return item
+
+
+def parse_patterns(text: str) -> List[str]:
+    """Split "*.png; *.exr, jpg" into lowercase globs; bare extensions become "*.ext"."""
+    patterns = []
+    for part in text.replace(",", ";").split(";"):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if not any(c in part for c in "*?["):
+            part = "*." + part.lstrip(".")
+        patterns.append(part)
+    return patterns
+
+
+def iter_folder(root: str, patterns: Sequence[str] = (), limit: int = 0,
+                cancel: Optional[threading.Event] = None) -> Iterator[str]:
+    """
+    Yield file paths under root, depth first, as they are discovered.
+
+    Only one open os.scandir iterator per directory level is held, so memory
+    stays proportional to the tree depth rather than the number of entries.
+    Symlinked directories are not followed.
+    """
+    try:
+        stack = [os.scandir(root)]
+    except OSError:
+        return
+
+    count = 0
+    try:
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                entry = next(stack[-1])
+            except (StopIteration, OSError):
+                stack.pop().close()
+                continue
+
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(os.scandir(entry.path))
+                    continue
+            except OSError:
+                continue
+
+            if patterns:
+                name = entry.name.lower()
+                if not any(fnmatch.fnmatchcase(name, pat) for pat in patterns):
+                    continue
+
+            yield entry.path
+            count += 1
+            if limit and count >= limit:
+                return
+    finally:
+        for it in stack:
+            it.close()
+
+
+class IngestJob(QtCore.QObject):
+    """
+    Validates dropped paths on a worker thread and hands them back in batches.
+
+    A batch is flushed once it reaches batch_size items or flush_interval
+    seconds have passed, so the GUI thread does one model insert per batch
+    instead of one per file.
+
+    With expand_folders, dropped directories are walked with iter_folder and
+    their files streamed in instead; total is then unknown (0) up front.
+    """
+
+    batch_ready = QtCore.Signal(object)  # List[StationItem]
+    progress = QtCore.Signal(int, int)   # done, total
+    finished = QtCore.Signal()
+
+    def __init__(self, paths: List[str], expand_folders: bool = False, patterns: Sequence[str] = (),
+                 limit: int = 0, batch_size: int = 256, flush_interval: float = 0.05, parent=None) -> None:
+        super().__init__(parent)
+        self.paths = paths
+        self.expand_folders = expand_folders
+        self.patterns = list(patterns)
+        self.limit = limit
+        self.total = 0 if expand_folders else len(paths)
+        self.done = 0
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mfs-ingest", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _iter_paths(self) -> Iterator[Tuple[str, bool]]:
+        # Yields (path, known_to_exist); the limit caps expanded files only
+        expanded = 0
+        for p in self.paths:
+            if self.expand_folders and os.path.isdir(p):
+                if self.limit and expanded >= self.limit:
+                    continue
+                remaining = (self.limit - expanded) if self.limit else 0
+                for f in iter_folder(p, self.patterns, remaining, self._cancel):
+                    expanded += 1
+                    yield f, True
+            else:
+                yield p, False
+
+    def _run(self) -> None:
+        batch: List[StationItem] = []
+        last_flush = time.monotonic()
+        done = 0
+
+        for p, exists in self._iter_paths():
+            if self._cancel.is_set():
+                break
+            done += 1
+            if exists or os.path.exists(p):
+                batch.append(file_item(p))
+
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or (now - last_flush) >= self.flush_interval:
+                self._flush(batch, done)
+                batch = []
+                last_flush = now
+
+        self._flush(batch, done)
+        self.finished.emit()
+
+    def _flush(self, batch: List[StationItem], done: int) -> None:
+        self.done = done
+        if batch and not self._cancel.is_set():
+            self.batch_ready.emit(batch)
+        self.progress.emit(done, self.total)
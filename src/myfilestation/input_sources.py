@@ -0,0 +1,382 @@
+import ctypes
+import sys
+import threading
+from ctypes import wintypes
+from typing import Callable, List, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+
+class InputSource(QtCore.QObject):
+    """
+    Where EdgeSensorWindow gets its mouse state from.
+
+    Sources report left-button transitions, and cursor moves only while the
+    left button is held, so nothing reaches the sensor while the user is just
+    moving the mouse around. Positions are Qt global (logical) coordinates.
+    """
+
+    button_changed = QtCore.Signal(bool, QtCore.QPoint)  # left down, pos
+    moved = QtCore.Signal(QtCore.QPoint)                 # pos, button held
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        # Number of times this source woke the GUI thread
+        self.wakeups = 0
+
+    def start(self) -> None:
+        """Begin delivering events; calling it again is a no-op."""
+
+    def stop(self) -> None:
+        pass
+
+    def is_left_down(self) -> bool:
+        return False
+
+    def set_interval_policy(self, policy: Optional["IntervalPolicy"]) -> None:
+        """Pacing for sources that poll; push-based sources ignore it."""
+
+
+# (left_down, still_polls, pos) -> next poll interval in ms
+IntervalPolicy = Callable[[bool, int, QtCore.QPoint], int]
+
+
+class PollingInputSource(InputSource):
+    """
+    Samples GetAsyncKeyState and the cursor on a timer.
+
+    Without a policy it polls at a fixed interval_ms. An interval policy is
+    asked for the next interval after every poll, which lets the owner back
+    off while idle and speed up during a drag.
+    """
+
+    def __init__(self, interval_ms: int = 16, parent=None) -> None:
+        super().__init__(parent)
+        # pywin32 is imported here, not at module level, so the other sources
+        # (ScriptedInputSource in particular) work without it
+        import win32api
+        import win32con
+
+        self._key_state = win32api.GetAsyncKeyState
+        self._vk_lbutton = win32con.VK_LBUTTON
+        self._down = False
+        self._last_pos: Optional[QtCore.QPoint] = None
+        self._still_polls = 0
+        self._policy: Optional[IntervalPolicy] = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._poll)
+
+    def start(self) -> None:
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def is_left_down(self) -> bool:
+        return self._down
+
+    def set_interval_policy(self, policy: Optional[IntervalPolicy]) -> None:
+        self._policy = policy
+
+    def interval(self) -> int:
+        return self._timer.interval()
+
+    def _poll(self) -> None:
+        self.wakeups += 1
+        down = (self._key_state(self._vk_lbutton) & 0x8000) != 0
+        pos = QtGui.QCursor.pos()
+
+        if pos == self._last_pos:
+            self._still_polls += 1
+        else:
+            self._still_polls = 0
+
+        if down != self._down:
+            self._down = down
+            self._last_pos = pos
+            self.button_changed.emit(down, pos)
+        elif down and pos != self._last_pos:
+            self._last_pos = pos
+            self.moved.emit(pos)
+        else:
+            self._last_pos = pos
+
+        if self._policy is not None:
+            ms = max(1, int(self._policy(down, self._still_polls, pos)))
+            if ms != self._timer.interval():
+                self._timer.setInterval(ms)
+
+
+# -------- low-level mouse hook (Windows) --------
+WH_MOUSE_LL = 14
+WM_QUIT = 0x0012
+WM_MOUSEMOVE = 0x0200
+WM_LBUTTONDOWN = 0x0201
+WM_LBUTTONUP = 0x0202
+
+_EV_DOWN = 1
+_EV_UP = 2
+_EV_MOVE = 3
+
+if sys.platform == "win32":
+    _LRESULT = ctypes.c_ssize_t
+    _HOOKPROC = ctypes.WINFUNCTYPE(_LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _user32.SetWindowsHookExW.argtypes = [ctypes.c_int, _HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+    _user32.SetWindowsHookExW.restype = ctypes.c_void_p
+    _user32.CallNextHookEx.argtypes = [ctypes.c_void_p, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+    _user32.CallNextHookEx.restype = _LRESULT
+    _user32.UnhookWindowsHookEx.argtypes = [ctypes.c_void_p]
+    _user32.GetMessageW.argtypes = [ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+    _user32.PostThreadMessageW.argtypes = [wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    _kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+
+class LowLevelMouseHookSource(InputSource):
+    """
+    Push-based source built on a WH_MOUSE_LL hook running on its own thread.
+
+    The hook callback only forwards a tiny event code to the GUI thread and
+    returns; Windows drops hooks that stall. Moves are coalesced so at most
+    one is queued at a time, and ignored entirely while the button is up.
+    Positions are read with QCursor.pos() on the GUI thread, which keeps them
+    in Qt's DPI-aware coordinate space.
+
+    Windows also removes a hook silently if a callback ever exceeds
+    LowLevelHooksTimeout (a paging storm is enough). Every LIVENESS_MS the
+    GUI thread checks whether the cursor moved while the hook saw no events;
+    if so the hook is reinstalled, and after MAX_REINSTALLS the source falls
+    back to polling for the rest of the session.
+    """
+
+    LIVENESS_MS = 3000
+    MAX_REINSTALLS = 3
+
+    _raw_event = QtCore.Signal(int)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._down = False
+        self._move_pending = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._hook = None
+        self._proc = None
+        self._installed = threading.Event()
+        self._raw_event.connect(self._on_raw_event, QtCore.Qt.QueuedConnection)
+
+        # Hook callbacks seen (any mouse event), and what the last check saw
+        self._events = 0
+        self._seen_events = 0
+        self._seen_pos = QtCore.QPoint()
+        self.reinstalls = 0
+        self._policy: Optional[IntervalPolicy] = None
+        self._fallback: Optional[PollingInputSource] = None
+        self._liveness = QtCore.QTimer(self)
+        self._liveness.setTimerType(QtCore.Qt.CoarseTimer)
+        self._liveness.setInterval(self.LIVENESS_MS)
+        self._liveness.timeout.connect(self._check_alive)
+
+    @staticmethod
+    def available() -> bool:
+        return sys.platform == "win32"
+
+    def is_left_down(self) -> bool:
+        if self._fallback is not None:
+            return self._fallback.is_left_down()
+        return self._down
+
+    def set_interval_policy(self, policy: Optional[IntervalPolicy]) -> None:
+        self._policy = policy
+        if self._fallback is not None:
+            self._fallback.set_interval_policy(policy)
+
+    def start(self) -> None:
+        if self._fallback is not None:
+            self._fallback.start()
+            return
+        if self._thread is not None:
+            return
+        self._install()
+        self._seen_events = self._events
+        self._seen_pos = QtGui.QCursor.pos()
+        self._liveness.start()
+
+    def stop(self) -> None:
+        self._liveness.stop()
+        if self._fallback is not None:
+            self._fallback.stop()
+            return
+        self._uninstall()
+
+    def _install(self) -> None:
+        self._installed.clear()
+        self._thread = threading.Thread(target=self._hook_thread, name="mfs-mouse-hook", daemon=True)
+        self._thread.start()
+        self._installed.wait(1.0)
+        if not self._hook:
+            self._thread = None
+            raise OSError("SetWindowsHookEx(WH_MOUSE_LL) failed")
+
+    def _uninstall(self) -> None:
+        if self._thread is None:
+            return
+        _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join(1.0)
+        self._thread = None
+
+    def _hook_thread(self) -> None:
+        self._thread_id = _kernel32.GetCurrentThreadId()
+
+        def proc(n_code, w_param, l_param):
+            if n_code >= 0:
+                self._events += 1
+                if w_param == WM_LBUTTONDOWN:
+                    self._down = True
+                    self._raw_event.emit(_EV_DOWN)
+                elif w_param == WM_LBUTTONUP:
+                    self._down = False
+                    self._raw_event.emit(_EV_UP)
+                elif w_param == WM_MOUSEMOVE and self._down and not self._move_pending:
+                    self._move_pending = True
+                    self._raw_event.emit(_EV_MOVE)
+            return _user32.CallNextHookEx(None, n_code, w_param, l_param)
+
+        # Keep a reference: ctypes callbacks die with their Python object
+        self._proc = _HOOKPROC(proc)
+        self._hook = _user32.SetWindowsHookExW(WH_MOUSE_LL, self._proc, _kernel32.GetModuleHandleW(None), 0)
+        self._installed.set()
+        if not self._hook:
+            return
+
+        msg = wintypes.MSG()
+        while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            pass
+
+        _user32.UnhookWindowsHookEx(self._hook)
+        self._hook = None
+
+    def _on_raw_event(self, kind: int) -> None:
+        self.wakeups += 1
+        pos = QtGui.QCursor.pos()
+        if kind == _EV_MOVE:
+            self._move_pending = False
+            if self._down:
+                self.moved.emit(pos)
+        else:
+            self.button_changed.emit(kind == _EV_DOWN, pos)
+
+    def _check_alive(self) -> None:
+        pos = QtGui.QCursor.pos()
+        moved = pos != self._seen_pos
+        self._seen_pos = pos
+        if self._events != self._seen_events or not moved:
+            self._seen_events = self._events
+            return
+
+        # The mouse moved and the hook heard nothing: Windows dropped it
+        self._uninstall()
+        if self.reinstalls < self.MAX_REINSTALLS:
+            self.reinstalls += 1
+            try:
+                self._install()
+            except OSError:
+                pass
+            else:
+                self._seen_events = self._events
+                self._sync_button(pos)
+                return
+
+        self._liveness.stop()
+        fallback = PollingInputSource(parent=self)
+        fallback._down = self._down
+        fallback.set_interval_policy(self._policy)
+        fallback.button_changed.connect(self.button_changed)
+        fallback.moved.connect(self.moved)
+        self._fallback = fallback
+        fallback.start()
+
+    def _sync_button(self, pos: QtCore.QPoint) -> None:
+        """Report a button change the hook missed while it was gone."""
+        import win32api
+        import win32con
+
+        down = (win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000) != 0
+        if down != self._down:
+            self._down = down
+            self.button_changed.emit(down, pos)
+
+
+class ScriptedInputSource(InputSource):
+    """
+    Deterministic source for tests and benchmarks.
+
+    Call press/move/release directly, or play() a script of
+    (delay_ms, "press" | "move" | "release", x, y) steps on a timer.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._down = False
+        self._script: List[Tuple[int, str, int, int]] = []
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._step)
+
+    def is_left_down(self) -> bool:
+        return self._down
+
+    def press(self, x: int, y: int) -> None:
+        self.wakeups += 1
+        self._down = True
+        self.button_changed.emit(True, QtCore.QPoint(x, y))
+
+    def move(self, x: int, y: int) -> None:
+        if self._down:
+            self.wakeups += 1
+            self.moved.emit(QtCore.QPoint(x, y))
+
+    def release(self, x: int, y: int) -> None:
+        self.wakeups += 1
+        self._down = False
+        self.button_changed.emit(False, QtCore.QPoint(x, y))
+
+    def play(self, script: List[Tuple[int, str, int, int]]) -> None:
+        self._script = list(script)
+        self._schedule()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._script = []
+
+    def _schedule(self) -> None:
+        if self._script:
+            self._timer.start(max(0, self._script[0][0]))
+
+    def _step(self) -> None:
+        _, kind, x, y = self._script.pop(0)
+        getattr(self, kind)(x, y)
+        self._schedule()
+
+
+def create_input_source(backend: str = "auto", parent=None) -> InputSource:
+    """backend: "auto" (hook, falling back to polling), "hook" or "poll"."""
+    if backend in ("auto", "hook") and LowLevelMouseHookSource.available():
+        source = LowLevelMouseHookSource(parent)
+        try:
+            source.start()
+            return source
+        except OSError:
+            if backend == "hook":
+                raise
+            source.deleteLater()
+
+    source = PollingInputSource(parent=parent)
+    source.start()
+    return source
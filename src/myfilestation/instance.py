@@ -0,0 +1,75 @@
+import json
+import os
+from typing import Dict
+
+from PySide6 import QtCore, QtNetwork
+
+from .ipc import server_name
+from .settings import get_appdata_dir
+
+
+class InstanceServer(QtCore.QObject):
+    """
+    Receiving end of the single-instance channel (ipc.py is the client).
+
+    Only one process can hold the instance lock; that process listens for
+    JSON-line messages from later launches and `add` commands. Each batch of
+    paths is handed on as soon as its line arrives.
+    """
+
+    paths_received = QtCore.Signal(object)  # List[str]
+    show_requested = QtCore.Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._lock = QtCore.QLockFile(os.path.join(get_appdata_dir(), "instance.lock"))
+        self._server = QtNetwork.QLocalServer(self)
+        self._server.setSocketOptions(QtNetwork.QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: Dict[QtNetwork.QLocalSocket, bytes] = {}
+
+    def acquire(self) -> bool:
+        """Become the instance; False if another process already is."""
+        if not self._lock.tryLock(0):
+            return False
+        # We hold the lock, so any leftover socket file is stale
+        QtNetwork.QLocalServer.removeServer(server_name())
+        return self._server.listen(server_name())
+
+    def close(self) -> None:
+        self._server.close()
+        self._lock.unlock()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            sock = self._server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._read(s))
+            sock.disconnected.connect(lambda s=sock: self._finish(s))
+
+    def _read(self, sock: QtNetwork.QLocalSocket) -> None:
+        buf = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        *lines, rest = buf.split(b"\n")
+        self._buffers[sock] = rest
+        for line in lines:
+            self._handle(line)
+
+    def _finish(self, sock: QtNetwork.QLocalSocket) -> None:
+        self._read(sock)
+        rest = self._buffers.pop(sock, b"")
+        if rest.strip():
+            self._handle(rest)
+        sock.deleteLater()
+
+    def _handle(self, line: bytes) -> None:
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            return
+        cmd = msg.get("cmd") if isinstance(msg, dict) else None
+        if cmd == "add":
+            paths = [p for p in msg.get("paths", []) if isinstance(p, str)]
+            if paths:
+                self.paths_received.emit(paths)
+        elif cmd == "show":
+            self.show_requested.emit()
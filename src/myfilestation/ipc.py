@@ -0,0 +1,95 @@
+"""
+Client side of the single-instance channel.
+
+Plain Python on purpose: `myfilestation add <paths>` must hand its paths to
+the running instance and exit without importing Qt. The running instance
+listens with a QLocalServer (see instance.py) on the address below; each
+message is one line of JSON, so large path lists are streamed in batches.
+"""
+
+import getpass
+import json
+import os
+import re
+import socket
+import sys
+import tempfile
+import time
+from typing import Iterable, List, Optional
+
+BATCH_SIZE = 256
+
+
+def server_name() -> str:
+    """Name passed to QLocalServer.listen(); per user, so sessions don't collide."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    user = re.sub(r"[^A-Za-z0-9_.-]", "_", user) or "user"
+    if sys.platform == "win32":
+        return f"MyFileStation-{user}"
+    # A full path makes QLocalServer use exactly this socket file
+    return os.path.join(tempfile.gettempdir(), f"myfilestation-{user}.sock")
+
+
+def _connect(timeout: float):
+    """A writable binary stream to the running instance, or None if there is none."""
+    name = server_name()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if sys.platform == "win32":
+                return open(r"\\.\pipe" + "\\" + name, "wb", buffering=0)
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                s.settimeout(timeout)
+                s.connect(name)
+            except OSError:
+                s.close()
+                raise
+            return s.makefile("wb", buffering=0)
+        except (FileNotFoundError, ConnectionRefusedError):
+            # No pipe, or a socket file left behind by a crashed instance
+            return None
+        except OSError:
+            # Pipe busy or server between connections: retry briefly
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.01)
+
+
+def send(messages: Iterable[dict], timeout: float = 1.0) -> bool:
+    """Deliver messages to the running instance; False if none is running."""
+    stream = _connect(timeout)
+    if stream is None:
+        return False
+    try:
+        with stream:
+            for msg in messages:
+                stream.write(json.dumps(msg).encode("utf-8") + b"\n")
+    except OSError:
+        return False
+    return True
+
+
+def add_messages(paths: List[str]) -> Iterable[dict]:
+    for i in range(0, len(paths), BATCH_SIZE):
+        yield {"cmd": "add", "paths": paths[i:i + BATCH_SIZE]}
+    yield {"cmd": "show"}
+
+
+def send_add(paths: List[str], timeout: float = 1.0) -> bool:
+    # Relative paths mean something only in the caller's working directory
+    return send(add_messages([os.path.abspath(p) for p in paths]), timeout)
+
+
+def send_show(timeout: float = 0.2) -> bool:
+    return send([{"cmd": "show"}], timeout)
+
+
+def parse_args(argv: List[str]) -> Optional[List[str]]:
+    """Paths of an `add <paths...>` command line, else None."""
+    if argv and argv[0] == "add":
+        return argv[1:]
+    return None
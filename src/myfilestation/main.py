@@ -1,12 +1,14 @@
+import time
+
+# Startup latency is measured from here, before any heavy import
+_T0 = time.perf_counter()
+
+import os
 import sys
 import traceback
 import ctypes
-from PySide6 import QtWidgets
 
-from .settings import SettingsService
-from .shelf_window import ShelfWindow
-from .edge_sensor import EdgeSensorWindow
-from .tray import TrayController
+from . import ipc
 
 
 def is_running_as_admin() -> bool:
@@ -17,6 +19,17 @@ def is_running_as_admin() -> bool:
 
 
 def main() -> None:
+    # `add <paths...>` and repeat launches are forwarded to the running
+    # instance before Qt is even imported
+    pending = ipc.parse_args(sys.argv[1:])
+    if pending is not None:
+        if ipc.send_add(pending):
+            return
+    elif ipc.send_show():
+        return
+
+    from PySide6 import QtWidgets
+
     try:
         app = QtWidgets.QApplication(sys.argv)
         app.setApplicationName("MyFileStation")
@@ -31,19 +44,65 @@ def main() -> None:
             )
             return
 
+        from .instance import InstanceServer
+        from .settings import SettingsService
+        from .startup import LazyShelf, StartupTimer
+
+        instance = InstanceServer(app)
+        if not instance.acquire():
+            # Another instance is starting up right now; let it have the stage
+            if pending:
+                ipc.send_add(pending, timeout=5.0)
+            return
+        app.aboutToQuit.connect(instance.close)
+
         settings_service = SettingsService()
         settings = settings_service.load()
 
-        shelf = ShelfWindow(settings)
-        sensor = EdgeSensorWindow(settings)
+        from . import metrics
+        from .settings import get_appdata_dir
+
+        metrics.set_enabled(settings.metrics_enabled)
+        metrics.REGISTRY.start_periodic_dump(
+            os.path.join(get_appdata_dir(), "metrics.json"), settings.metrics_dump_interval_s
+        )
+        if settings.stall_threshold_ms > 0:
+            from .stall_detector import StallDetector
+
+            stall = StallDetector(settings.stall_threshold_ms, parent=app)
+            stall.start()
+            app.aboutToQuit.connect(stall.stop)
+        timer = StartupTimer(_T0)
+
+        # Sensor and tray first; the shelf is only built when needed (or pre-warmed)
+        from .drag_tracker import DragSessionTracker
+        from .edge_sensor import EdgeSensorWindow
+        from .tray import TrayController
+
+        # One drag tracker feeds both the edge sensor and the shelf's auto-hide
+        tracker = DragSessionTracker(settings)
+        shelf = LazyShelf(settings, tracker, timer)
+        sensor = EdgeSensorWindow(settings, tracker)
 
         def on_edge_drag(_):
             shelf.show_from_edge_drag()
 
 
         sensor.supported_drag_detected.connect(on_edge_drag)
-
-        TrayController(shelf, sensor, settings, settings_service)
+        instance.paths_received.connect(shelf.add_paths)
+        instance.show_requested.connect(shelf.show_soft)
+
+        # Keep a reference so the tray icon lives as long as the app
+        tray = TrayController(shelf, sensor, settings, settings_service)
+        timer.mark("tray")
+
+        if pending:
+            # Started by `add` with no instance running: we are it now
+            shelf.add_paths([os.path.abspath(p) for p in pending])
+        elif settings.prewarm_shelf_ms >= 0:
+            shelf.prewarm(settings.prewarm_shelf_ms)
+        # Runs that never show the shelf still log their startup time
+        app.aboutToQuit.connect(timer.report)
 
         sys.exit(app.exec())
 
@@ -0,0 +1,78 @@
+import mimetypes
+import os
+import time
+from typing import Optional
+
+from .file_watcher import FileState
+from .models import ItemType, StationItem
+
+
+# Friendlier names for the types people most often shelve
+_KINDS = {
+    ".pdf": "PDF document",
+    ".zip": "ZIP archive",
+    ".7z": "7-Zip archive",
+    ".rar": "RAR archive",
+    ".exe": "Application",
+    ".msi": "Installer",
+    ".doc": "Word document",
+    ".docx": "Word document",
+    ".xls": "Excel workbook",
+    ".xlsx": "Excel workbook",
+    ".ppt": "PowerPoint presentation",
+    ".pptx": "PowerPoint presentation",
+    ".lnk": "Shortcut",
+}
+
+
+def describe_kind(item: StationItem, is_dir: bool = False) -> str:
+    """Short human-readable type, e.g. "PNG image", "Folder", "Text"."""
+    if item.item_type == ItemType.TEXT_TEMP:
+        return "Text"
+    if item.item_type == ItemType.IMAGE_TEMP:
+        return "Image"
+    if is_dir:
+        return "Folder"
+
+    ext = os.path.splitext(item.path)[1].lower()
+    if ext in _KINDS:
+        return _KINDS[ext]
+    mime, _ = mimetypes.guess_type(item.path, strict=False)
+    if mime:
+        major, minor = mime.split("/", 1)
+        if major in ("image", "video", "audio"):
+            return f"{ext[1:].upper()} {major}"
+        if major == "text":
+            return "Text document"
+    return f"{ext[1:].upper()} file" if ext else "File"
+
+
+def format_size(n: Optional[int]) -> str:
+    if n is None:
+        return ""
+    size = float(n)
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            break
+        size /= 1024
+    if unit == "bytes":
+        return f"{n:,} bytes"
+    return f"{size:.1f} {unit}"
+
+
+def format_mtime(t: Optional[float]) -> str:
+    if t is None:
+        return ""
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(t))
+
+
+def apply_state(item: StationItem, state: Optional[FileState]) -> bool:
+    """Copy what the watcher saw into item; True if anything changed."""
+    if state is None or not state.exists:
+        return False
+    size = None if state.is_dir else state.size
+    kind = describe_kind(item, state.is_dir)
+    if (item.size, item.mtime, item.kind) == (size, state.mtime, kind):
+        return False
+    item.size, item.mtime, item.kind = size, state.mtime, kind
+    return True
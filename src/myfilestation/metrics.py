@@ -0,0 +1,214 @@
+"""
+Lightweight in-process metrics: counters, latency histograms and timing spans.
+
+    from . import metrics
+
+    metrics.inc("shelf.items_added", len(items))
+    with metrics.span("shelf.drop"):
+        ...
+
+    @metrics.timed("temp.write_text")
+    def create_temp_text_file(...): ...
+
+Collection is off by default. While off, inc()/observe() return after one
+flag check and span() hands out a shared no-op context manager, so
+instrumented hot paths cost close to nothing. Plain Python with no Qt, so
+worker threads can record too.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Histogram bucket upper bounds in ms: 10 µs up to ~84 s, four buckets per
+# doubling, so percentiles are accurate to within ~19%
+_STEPS_PER_DOUBLING = 4
+_BOUNDS: List[float] = [0.01 * 2 ** (i / _STEPS_PER_DOUBLING) for i in range(24 * _STEPS_PER_DOUBLING)]
+
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * (len(_BOUNDS) + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        # Bucket i holds values up to _BOUNDS[i]; the last one everything above
+        if value <= _BOUNDS[0]:
+            i = 0
+        else:
+            i = min(len(_BOUNDS), math.ceil(_STEPS_PER_DOUBLING * math.log2(value / _BOUNDS[0]) - 1e-9))
+        self.buckets[i] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (capped at max)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.max, _BOUNDS[i]) if i < len(_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+        }
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class _Span:
+    __slots__ = ("_registry", "_name", "_t0")
+
+    def __init__(self, registry: "MetricsRegistry", name: str) -> None:
+        self._registry = registry
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._registry.observe(self._name, (time.perf_counter() - self._t0) * 1000.0)
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._started = time.time()
+        self._stop = threading.Event()
+        self._dumper: Optional[threading.Thread] = None
+
+    # -------- recording --------
+    def inc(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name: str, value_ms: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            h = self._histograms.get(name)
+            if h is None:
+                h = self._histograms[name] = Histogram()
+            h.add(value_ms)
+
+    def span(self, name: str):
+        """Context manager recording its duration (ms) into histogram name."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator form of span()."""
+        def wrap(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, (time.perf_counter() - t0) * 1000.0)
+            return inner
+        return wrap
+
+    # -------- reporting --------
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._started = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self._started,
+                "taken": time.time(),
+                "counters": dict(sorted(self._counters.items())),
+                "histograms": {k: h.to_dict() for k, h in sorted(self._histograms.items())},
+            }
+
+    def dump(self, path: str) -> str:
+        """Write snapshot() as JSON to path (atomically); returns path."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def start_periodic_dump(self, path: str, interval_s: float) -> None:
+        """Rewrite path every interval_s seconds on a background thread."""
+        if self._dumper is not None or interval_s <= 0:
+            return
+        stop = self._stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval_s):
+                if self.enabled:
+                    try:
+                        self.dump(path)
+                    except OSError:
+                        pass
+
+        self._dumper = threading.Thread(target=run, name="mfs-metrics", daemon=True)
+        self._dumper.start()
+
+    def stop_periodic_dump(self) -> None:
+        self._stop.set()
+        self._dumper = None
+
+
+# Process-wide registry and shortcuts to it
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+span = REGISTRY.span
+timed = REGISTRY.timed
+snapshot = REGISTRY.snapshot
+dump = REGISTRY.dump
+
+
+def set_enabled(enabled: bool) -> None:
+    REGISTRY.enabled = enabled
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from typing import Optional
 import uuid
@@ -20,7 +20,14 @@ class StationItem:
     display_name: str
     is_pinned: bool = False
     thumbnail_path: Optional[str] = None
-    added_at: float = time.time()
+    added_at: float = field(default_factory=time.time)
+    # Set for IMAGE_TEMP items once their temp file has been encoded
+    encode_ms: Optional[float] = None
+    encoded_bytes: Optional[int] = None
+    # File metadata, filled in the background by the shelf's FileWatcher
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+    kind: str = ""
 
     @staticmethod
     def new(item_type: ItemType, path: str, display_name: str, thumbnail_path: Optional[str] = None) -> "StationItem":
@@ -31,3 +38,17 @@ class StationItem:
             display_name=display_name,
             thumbnail_path=thumbnail_path,
         )
+
+    def to_dict(self) -> dict:
+        # Every field is a scalar, so a shallow copy is a full snapshot
+        # (asdict deep-copies, and is ~50x slower for a 10k-item drop)
+        d = dict(vars(self))
+        d["item_type"] = self.item_type.value
+        return d
+
+    @staticmethod
+    def from_dict(d: dict) -> "StationItem":
+        known = {f.name for f in fields(StationItem)}
+        kwargs = {k: v for k, v in d.items() if k in known}
+        kwargs["item_type"] = ItemType(kwargs["item_type"])
+        return StationItem(**kwargs)
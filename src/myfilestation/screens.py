@@ -0,0 +1,127 @@
+import bisect
+from typing import List, Optional, Tuple
+
+from PySide6 import QtCore, QtGui
+
+
+class ScreenInfo:
+    """Precomputed geometry for one screen."""
+
+    __slots__ = ("geometry", "available", "left_edge", "right_edge")
+
+    def __init__(self, geometry: QtCore.QRect, available: QtCore.QRect) -> None:
+        self.geometry = QtCore.QRect(geometry)
+        self.available = QtCore.QRect(available)
+        # Dock edges in global coordinates, inner edges between monitors included
+        self.left_edge = self.available.x()
+        self.right_edge = self.available.x() + self.available.width()
+
+    @classmethod
+    def from_screen(cls, screen: QtGui.QScreen) -> "ScreenInfo":
+        return cls(screen.geometry(), screen.availableGeometry())
+
+    def edge_distance(self, x: int, side: str) -> int:
+        if side == "left":
+            return x - self.left_edge
+        return self.right_edge - x
+
+    def gap_to(self, pos: QtCore.QPoint) -> int:
+        """Manhattan distance from pos to this screen, 0 if it is on it."""
+        g = self.geometry
+        dx = max(g.left() - pos.x(), 0, pos.x() - g.right())
+        dy = max(g.top() - pos.y(), 0, pos.y() - g.bottom())
+        return dx + dy
+
+
+class ScreenTable:
+    """
+    Screens bucketed into vertical bands at every screen's left and right
+    edge, so finding the screen under a point is a bisect plus a check of
+    the one or two screens stacked in that band.
+
+    With mixed DPI on Windows, Qt keeps each screen's top-left in device
+    pixels but scales its size down, so the screens' global rects leave gaps
+    between monitors. A point in a gap (or off every screen) belongs to the
+    nearest screen, not to the primary one as with QGuiApplication.screenAt.
+    """
+
+    def __init__(self, screens: List[ScreenInfo]) -> None:
+        self.screens = list(screens)
+        xs = sorted({s.geometry.left() for s in screens} | {s.geometry.right() + 1 for s in screens})
+        self._xs = xs
+        self._bands: List[Tuple[ScreenInfo, ...]] = [
+            tuple(s for s in screens if s.geometry.left() <= x <= s.geometry.right()) for x in xs
+        ]
+
+    def screen_at(self, pos: QtCore.QPoint) -> Optional[ScreenInfo]:
+        i = bisect.bisect_right(self._xs, pos.x()) - 1
+        if i >= 0:
+            y = pos.y()
+            for info in self._bands[i]:
+                if info.geometry.top() <= y <= info.geometry.bottom():
+                    return info
+        if not self.screens:
+            return None
+        return min(self.screens, key=lambda s: s.gap_to(pos))
+
+
+class ScreenGeometryService(QtCore.QObject):
+    """
+    Cached screen layout shared by the edge sensor and the shelf.
+
+    The ScreenTable is rebuilt only when a screen is added or removed or a
+    screen's geometry changes; every lookup in between is a table hit.
+    """
+
+    changed = QtCore.Signal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._table = ScreenTable([])
+        self.rebuilds = 0
+
+        app = QtGui.QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._rebuild)
+        app.primaryScreenChanged.connect(self._rebuild)
+        for screen in app.screens():
+            self._watch(screen)
+        self._rebuild()
+
+    def _watch(self, screen: QtGui.QScreen) -> None:
+        screen.geometryChanged.connect(self._rebuild)
+        screen.availableGeometryChanged.connect(self._rebuild)
+
+    def _on_screen_added(self, screen: QtGui.QScreen) -> None:
+        self._watch(screen)
+        self._rebuild()
+
+    def _rebuild(self, *_) -> None:
+        self.rebuilds += 1
+        self._table = ScreenTable([ScreenInfo.from_screen(s) for s in QtGui.QGuiApplication.screens()])
+        self.changed.emit()
+
+    def screen_at(self, pos: QtCore.QPoint) -> Optional[ScreenInfo]:
+        """Screen containing pos, else the nearest screen."""
+        return self._table.screen_at(pos)
+
+    def edge_distance(self, pos: QtCore.QPoint, side: str) -> int:
+        info = self.screen_at(pos)
+        if info is None:
+            return 1 << 30
+        return info.edge_distance(pos.x(), side)
+
+    def available_geometry_at(self, pos: QtCore.QPoint) -> Optional[QtCore.QRect]:
+        info = self.screen_at(pos)
+        return QtCore.QRect(info.available) if info is not None else None
+
+
+_service: Optional[ScreenGeometryService] = None
+
+
+def screen_geometry() -> ScreenGeometryService:
+    """Process-wide ScreenGeometryService, created on first use."""
+    global _service
+    if _service is None:
+        _service = ScreenGeometryService(QtGui.QGuiApplication.instance())
+    return _service
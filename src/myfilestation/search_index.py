@@ -0,0 +1,130 @@
+from typing import Dict, Iterable, Optional, Set
+
+from .models import StationItem
+
+
+def search_text(item: StationItem) -> str:
+    """Everything a shelf filter query matches against."""
+    return f"{item.display_name}\n{item.path}\n{item.kind}\n{item.item_type.value}".casefold()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Substring search over shelf items, maintained incrementally.
+
+    Every item's search text is broken into trigrams, each mapping to the ids
+    containing it. A query token of three or more characters narrows the
+    candidates to the intersection of its trigram sets (smallest first); the
+    survivors are then confirmed with a plain substring check, which also
+    handles tokens too short to have trigrams. While the user keeps typing,
+    a query that extends the previous one only re-checks the previous hits.
+
+    Removal only forgets the item's text; its ids stay in the trigram sets
+    as tombstones (harmless, since every hit is confirmed against the text)
+    until enough pile up to be worth compacting, which the next add() does.
+    Clearing a large shelf thus costs a dict pop per item.
+    """
+
+    def __init__(self) -> None:
+        self._text: Dict[str, str] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._dead: Set[str] = set()
+        self._last_query = ""
+        self._last_hits: Optional[Set[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    def add(self, item: StationItem) -> bool:
+        """Index or re-index item; False if its search text didn't change."""
+        text = search_text(item)
+        old = self._text.get(item.id)
+        if old == text:
+            return False
+        if old is not None:
+            self._discard_grams(item.id, old)
+        elif item.id in self._dead:
+            # Its stale grams would be compacted away along with the new ones
+            self._compact()
+        else:
+            self._maybe_compact()
+        self._text[item.id] = text
+        for g in _trigrams(text):
+            self._grams.setdefault(g, set()).add(item.id)
+        self._last_hits = None
+        return True
+
+    def remove(self, item_id: str) -> None:
+        if self._text.pop(item_id, None) is None:
+            return
+        if self._text:
+            self._dead.add(item_id)
+        else:
+            # Shelf cleared: nothing left to keep
+            self._grams, self._dead = {}, set()
+        self._last_hits = None
+
+    def retain(self, item_ids: Iterable[str]) -> None:
+        """Drop every item not in item_ids (after the model was reset)."""
+        keep = set(item_ids)
+        for item_id in [i for i in self._text if i not in keep]:
+            self.remove(item_id)
+
+    def _discard_grams(self, item_id: str, text: str) -> None:
+        for g in _trigrams(text):
+            ids = self._grams.get(g)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._grams[g]
+
+    def _maybe_compact(self) -> None:
+        if len(self._dead) > len(self._text) // 4 + 256:
+            self._compact()
+
+    def _compact(self) -> None:
+        # Set differences run in C: far cheaper than re-trigramming the survivors
+        dead = self._dead
+        grams = ((g, ids - dead) for g, ids in self._grams.items())
+        self._grams = {g: ids for g, ids in grams if ids}
+        self._dead = set()
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """Ids matching every whitespace-separated token; None for an empty query."""
+        query = query.casefold().strip()
+        tokens = query.split()
+        if not tokens:
+            self._last_query, self._last_hits = "", None
+            return None
+
+        if self._last_hits is not None and self._last_query and query.startswith(self._last_query):
+            pool: Iterable[str] = self._last_hits
+        else:
+            pool = self._candidates(tokens)
+
+        text = self._text
+        hits = set()
+        for i in pool:
+            s = text.get(i)
+            if s is not None and all(t in s for t in tokens):
+                hits.add(i)
+        self._last_query, self._last_hits = query, hits
+        return hits
+
+    def _candidates(self, tokens) -> Iterable[str]:
+        grams = sorted(
+            (self._grams.get(g, set()) for t in tokens if len(t) >= 3 for g in _trigrams(t)),
+            key=len,
+        )
+        if not grams:
+            return self._text.keys()
+        result = set(grams[0])
+        for ids in grams[1:]:
+            if not result:
+                break
+            result &= ids
+        return result
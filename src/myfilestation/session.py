@@ -0,0 +1,205 @@
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+from PySide6 import QtCore
+
+from .models import StationItem, ItemType
+
+
+class SessionStore(QtCore.QObject):
+    """
+    Durable record of the shelf contents.
+
+    Changes are appended to a line-based JSON journal by a background writer
+    thread; once the journal grows past compact_after lines the writer folds
+    it into a snapshot file. Replaying the journal is idempotent, so a crash
+    between writing the snapshot and truncating the journal is harmless.
+    """
+
+    restored = QtCore.Signal(object)  # List[StationItem]
+
+    # Re-sorts come in bursts (one per ingest batch): journal the order at
+    # most this often, and only the latest one
+    REORDER_DELAY_MS = 1000
+
+    def __init__(self, directory: str, compact_after: int = 1000, parent=None) -> None:
+        super().__init__(parent)
+        self._snapshot_path = os.path.join(directory, "session.json")
+        self._journal_path = os.path.join(directory, "session.journal")
+        self.compact_after = compact_after
+
+        # Owned by the writer thread: id -> item dict, in shelf order
+        self._state: "OrderedDict[str, dict]" = OrderedDict()
+        self._journal_lines = 0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="mfs-session", daemon=True)
+
+        self._pending_order: Optional[List[str]] = None
+        self._order_timer = QtCore.QTimer(self)
+        self._order_timer.setSingleShot(True)
+        self._order_timer.setInterval(self.REORDER_DELAY_MS)
+        self._order_timer.timeout.connect(self._flush_order)
+
+    def start(self) -> None:
+        """Load the previous session off the GUI thread; emits restored when done."""
+        self._thread.start()
+
+    def close(self, timeout: float = 2.0) -> None:
+        self._flush_order()
+        self._queue.put(None)
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    # -------- recording (GUI thread) --------
+    def record_add(self, items: Iterable[StationItem]) -> None:
+        dicts = [it.to_dict() for it in items]
+        if dicts:
+            self._queue.put({"op": "add", "items": dicts})
+
+    def record_update(self, item: StationItem) -> None:
+        self._queue.put({"op": "update", "item": item.to_dict()})
+
+    def record_metadata(self, items: Iterable[StationItem]) -> None:
+        """One journal line for a batch of size/mtime/kind updates."""
+        meta = [{"id": it.id, "size": it.size, "mtime": it.mtime, "kind": it.kind} for it in items]
+        if meta:
+            self._queue.put({"op": "meta", "items": meta})
+
+    def record_remove(self, item_ids: Iterable[str]) -> None:
+        ids = list(item_ids)
+        if ids:
+            self._queue.put({"op": "remove", "ids": ids})
+
+    def record_pin(self, item_id: str, pinned: bool) -> None:
+        self._queue.put({"op": "pin" if pinned else "unpin", "id": item_id})
+
+    def record_reorder(self, item_ids: Iterable[str]) -> None:
+        self._pending_order = list(item_ids)
+        if not self._order_timer.isActive():
+            self._order_timer.start()
+
+    def _flush_order(self) -> None:
+        self._order_timer.stop()
+        if self._pending_order is not None:
+            self._queue.put({"op": "reorder", "ids": self._pending_order})
+            self._pending_order = None
+
+    # -------- writer thread --------
+    def _apply(self, op: dict) -> None:
+        kind = op.get("op")
+        if kind == "add":
+            for d in op["items"]:
+                self._state[d["id"]] = d
+        elif kind == "update":
+            d = op["item"]
+            if d["id"] in self._state:
+                self._state[d["id"]] = d
+        elif kind == "meta":
+            for m in op["items"]:
+                d = self._state.get(m["id"])
+                if d is not None:
+                    d.update(m)
+        elif kind == "remove":
+            for item_id in op["ids"]:
+                self._state.pop(item_id, None)
+        elif kind in ("pin", "unpin"):
+            d = self._state.get(op["id"])
+            if d is not None:
+                d["is_pinned"] = kind == "pin"
+        elif kind == "reorder":
+            order = [i for i in op["ids"] if i in self._state]
+            seen = set(order)
+            rest = [i for i in self._state if i not in seen]
+            self._state = OrderedDict((i, self._state[i]) for i in order + rest)
+
+    def _load(self) -> List[StationItem]:
+        try:
+            with open(self._snapshot_path, "r", encoding="utf-8") as f:
+                for d in json.load(f).get("items", []):
+                    self._state[d["id"]] = d
+        except (OSError, ValueError, KeyError):
+            pass
+
+        try:
+            with open(self._journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        # Torn last write from a crash; everything before it is good.
+                        # Force a compaction so later appends don't land after it.
+                        self._journal_lines = self.compact_after
+                        break
+                    self._journal_lines += 1
+        except OSError:
+            pass
+
+        items = []
+        for d in self._state.values():
+            try:
+                item = StationItem.from_dict(d)
+            except (KeyError, TypeError, ValueError):
+                continue
+            # Temp files may have been cleaned up while we were not running
+            if item.item_type != ItemType.FILE and not os.path.exists(item.path):
+                continue
+            items.append(item)
+
+        self._state = OrderedDict((it.id, self._state[it.id]) for it in items)
+        return items
+
+    def _compact(self) -> None:
+        tmp = self._snapshot_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"items": list(self._state.values())}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._snapshot_path)
+            # Snapshot is durable; the journal can start over
+            with open(self._journal_path, "w", encoding="utf-8"):
+                pass
+            self._journal_lines = 0
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        self.restored.emit(self._load())
+        if self._journal_lines:
+            self._compact()
+
+        stop = False
+        while not stop:
+            ops = [self._queue.get()]
+            # Drain whatever piled up so one fsync covers the whole batch
+            while True:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for op in ops:
+                if op is None:
+                    stop = True
+                    break
+                self._apply(op)
+                lines.append(json.dumps(op, separators=(",", ":")))
+
+            if lines:
+                try:
+                    with open(self._journal_path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._journal_lines += len(lines)
+                except OSError:
+                    pass
+
+            if self._journal_lines >= self.compact_after:
+                self._compact()
@@ -1,6 +1,6 @@
 import json
 import os
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 
 
 def get_appdata_dir() -> str:
@@ -22,6 +22,83 @@ class AppSettings:
     # If True, start with Windows
     autostart: bool = False
 
+    # Encoding of pasted images: "png", "webp" (lossless) or "bmp" (fastest)
+    temp_image_format: str = "png"
+    # PNG zlib level 0-9; low levels encode much faster for a bit more size
+    png_compression: int = 1
+
+    # Build the hidden shelf this many ms after the tray is up; -1 = on first use
+    prewarm_shelf_ms: int = 1000
+
+    # Shelf order: sort_by "added", "name", "size" or "type";
+    # group_by "none", "type" or "folder"
+    sort_by: str = "added"
+    sort_descending: bool = False
+    group_by: str = "none"
+
+    # Background content hashing that flags identical files at different paths
+    detect_duplicate_content: bool = False
+
+    # Temp files no shelf item references are swept past these quotas
+    temp_store_max_mb: int = 512
+    temp_store_max_age_days: int = 7
+
+    # Collect timing metrics (tray: "Dump metrics"); the interval > 0 also
+    # rewrites metrics.json in the app data dir every that many seconds
+    metrics_enabled: bool = False
+    metrics_dump_interval_s: int = 0
+
+    # Log the GUI thread's stack to stalls.log when the event loop is blocked
+    # this long (ms); 0 turns the watchdog off
+    stall_threshold_ms: int = 750
+
+    # Edge sensor mouse input: "auto" (hook, else polling), "hook" or "poll"
+    input_backend: str = "auto"
+
+    # Edge trigger
+    edge_threshold: int = 48   # px near screen edge
+    drag_dist: int = 12        # pixels moved to treat as drag
+    drag_delay_ms: int = 60    # held time before treat as drag
+
+    # Polling backend schedule (ms); the hook backend ignores these
+    poll_idle_ms: int = 200    # button up, cursor still
+    poll_moving_ms: int = 50   # button up, cursor moving
+    poll_drag_ms: int = 16     # button down
+    poll_edge_ms: int = 8      # button down within edge_boost_px of the dock edge
+    edge_boost_px: int = 160
+
+    # On-disk thumbnail cache quota (MB); 0 disables the disk tier
+    thumbnail_cache_mb: int = 64
+
+    # If True, dropped folders are expanded into their files (Shift inverts)
+    expand_dropped_folders: bool = False
+    # Globs/extensions for expanded files, e.g. "*.png; exr"; empty = all
+    expand_folder_patterns: str = ""
+    # Max files taken from expanded folders per drop; 0 = no cap
+    expand_folder_limit: int = 20000
+
+
+_BOOL_STRINGS = {
+    "true": True, "1": True, "yes": True, "on": True,
+    "false": False, "0": False, "no": False, "off": False, "": False,
+}
+
+
+def _coerce(value, default):
+    # Keep the type of the default; unusable values fall back to it
+    if value is None:
+        # str(None) would "succeed" as "None"
+        return default
+    try:
+        if isinstance(default, bool):
+            if isinstance(value, str):
+                # bool("false") is True
+                return _BOOL_STRINGS.get(value.strip().lower(), default)
+            return bool(value)
+        return type(default)(value)
+    except (TypeError, ValueError):
+        return default
+
 
 class SettingsService:
     def __init__(self) -> None:
@@ -37,11 +114,11 @@ class SettingsService:
             with open(self._path, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            return AppSettings(
-                dock_side=data.get("dock_side", "right"),
-                remove_after_drag_out=bool(data.get("remove_after_drag_out", True)),
-                autostart=bool(data.get("autostart", False)),
-            )
+            s = AppSettings()
+            for fld in fields(AppSettings):
+                if fld.name in data:
+                    setattr(s, fld.name, _coerce(data[fld.name], getattr(s, fld.name)))
+            return s
         except Exception:
             # Fall back to defaults if config is broken
             return AppSettings()
@@ -0,0 +1,616 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from . import metrics
+from .duplicates import path_key
+from .metadata import format_mtime, format_size
+from .models import ItemType, StationItem
+from .search_index import TrigramIndex
+from .thumbnails import ThumbnailLoader
+
+
+# Custom role used to fetch the StationItem behind a row
+ItemRole = QtCore.Qt.UserRole
+# Display name of an item with the same content, if any
+DuplicateOfRole = QtCore.Qt.UserRole + 1
+# True when the item's file is gone from disk
+MissingRole = QtCore.Qt.UserRole + 2
+# Label of the group the item falls in, or None when the shelf isn't grouped
+GroupRole = QtCore.Qt.UserRole + 3
+# Signals only that a row's filter verdict changed (no data of its own)
+FilterRole = QtCore.Qt.UserRole + 4
+
+ROW_HEIGHT = 64
+ROW_SPACING = 8
+THUMB_SIZE = 44
+GROUP_HEADER_HEIGHT = 24
+
+SORT_MODES = ("added", "name", "size", "type")
+GROUP_MODES = ("none", "type", "folder")
+
+# Positions in the per-item sort key tuple
+_KEY_ADDED, _KEY_NAME, _KEY_SIZE, _KEY_TYPE, _KEY_FOLDER = range(5)
+_SORT_KEY = {"added": _KEY_ADDED, "name": _KEY_NAME, "size": _KEY_SIZE, "type": _KEY_TYPE}
+_GROUP_KEY = {"type": _KEY_TYPE, "folder": _KEY_FOLDER}
+
+
+def _runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """Sorted rows as contiguous (first, last) runs."""
+    runs: List[Tuple[int, int]] = []
+    if not rows:
+        return runs
+    start = prev = rows[0]
+    for r in rows[1:]:
+        if r != prev + 1:
+            runs.append((start, prev))
+            start = r
+        prev = r
+    runs.append((start, prev))
+    return runs
+
+
+def sort_keys(item: StationItem) -> Tuple:
+    """Every key the shelf can sort or group by, computed once per item change."""
+    folder = os.path.dirname(item.path).casefold() if item.item_type == ItemType.FILE else ""
+    return (
+        item.added_at,
+        item.display_name.casefold(),
+        (item.size is None, item.size or 0),  # unknown sizes sort last
+        (item.kind or item.item_type.value).casefold(),
+        folder,
+    )
+
+
+class ShelfItemModel(QtCore.QAbstractListModel):
+    """
+    List model backed by the shelf's item list.
+
+    The list object is shared with ShelfWindow.items, so every mutation must go
+    through this model to keep views in sync.
+
+    Rows are kept in the order set by set_sort(). Sort keys are precomputed per
+    item, so reordering is one list.sort() and one layoutChanged; views keep
+    their selection and no row is rebuilt.
+    """
+
+    # Item ids in their new row order, after a sort that moved anything
+    reordered = QtCore.Signal(list)
+
+    def __init__(self, items: List[StationItem], parent=None) -> None:
+        super().__init__(parent)
+        self._items = items
+        # id -> row, rebuilt after any operation that shifts rows
+        self._row_by_id: Dict[str, int] = {}
+        # path_key -> id of FILE items, so a file can only be on the shelf once,
+        # and back, so removing an item needn't normalize its path again
+        self._id_by_path: Dict[str, str] = {}
+        self._key_by_id: Dict[str, str] = {}
+        # id -> id of an earlier item with identical content
+        self._duplicate_of: Dict[str, str] = {}
+        self._missing: Set[str] = set()
+        # id -> sort_keys(item)
+        self._keys: Dict[str, Tuple] = {}
+
+        self.sort_mode = "added"
+        self.descending = False
+        self.group_mode = "none"
+        # Coalesces re-sorts after appends and metadata updates
+        self._sort_timer = QtCore.QTimer(self)
+        self._sort_timer.setSingleShot(True)
+        self._sort_timer.timeout.connect(self.sort_items)
+
+        for it in self._items:
+            if it.item_type == ItemType.FILE:
+                self._index_path(it.id, path_key(it.path))
+        self._reindex()
+
+    def _index_path(self, item_id: str, key: str) -> None:
+        self._id_by_path[key] = item_id
+        self._key_by_id[item_id] = key
+
+    def _reindex(self, start: int = 0) -> None:
+        # The path index is kept in step by append_items, update_path and _forget
+        if start == 0:
+            self._row_by_id = {}
+        keys = self._keys
+        for i in range(start, len(self._items)):
+            it = self._items[i]
+            self._row_by_id[it.id] = i
+            if it.id not in keys:
+                keys[it.id] = sort_keys(it)
+
+    # -------- Qt model API --------
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._items)):
+            return None
+        item = self._items[index.row()]
+        if role == ItemRole:
+            return item
+        if role == QtCore.Qt.DisplayRole:
+            return item.display_name
+        if role == QtCore.Qt.ToolTipRole:
+            return item.path
+        if role == MissingRole:
+            return item.id in self._missing
+        if role == GroupRole:
+            return self.group_label(item)
+        if role == DuplicateOfRole:
+            other = self.get(self._duplicate_of.get(item.id, ""))
+            return other.display_name if other is not None else None
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.ItemIsDropEnabled
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    # -------- shelf API --------
+    def item_at(self, row: int) -> Optional[StationItem]:
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def row_of(self, item_id: str) -> int:
+        return self._row_by_id.get(item_id, -1)
+
+    def get(self, item_id: str) -> Optional[StationItem]:
+        row = self._row_by_id.get(item_id)
+        return self._items[row] if row is not None else None
+
+    def find_path(self, path: str) -> Optional[str]:
+        """Id of the FILE item already holding path, compared normalized and case-insensitively."""
+        return self._id_by_path.get(path_key(path))
+
+    def append_items(self, items: Iterable[StationItem]) -> List[StationItem]:
+        """Append items, skipping files already on the shelf; returns the ones added."""
+        added = []
+        for it in items:
+            if it.item_type == ItemType.FILE:
+                key = path_key(it.path)
+                if key in self._id_by_path:
+                    continue
+                self._index_path(it.id, key)
+            added.append(it)
+        if not added:
+            return added
+        first = len(self._items)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(added) - 1)
+        self._items.extend(added)
+        self._reindex(first)
+        self.endInsertRows()
+        if not self._appends_in_order():
+            self._sort_timer.start(0)
+        return added
+
+    # -------- ordering --------
+    def set_sort(self, mode: str, descending: bool = False, group: str = "none") -> None:
+        self.sort_mode = mode if mode in SORT_MODES else "added"
+        self.descending = descending
+        self.group_mode = group if group in GROUP_MODES else "none"
+        self.sort_items()
+
+    def _appends_in_order(self) -> bool:
+        # New items are the newest, so they already belong at the end
+        return self.sort_mode == "added" and not self.descending and self.group_mode == "none"
+
+    def sort_items(self) -> None:
+        """Reorder rows by the current sort and grouping as a single layout change."""
+        self._sort_timer.stop()
+        if len(self._items) < 2:
+            return
+        keys = self._keys
+        k = _SORT_KEY[self.sort_mode]
+
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_ids = [self._items[i.row()].id for i in persistent]
+        before = [it.id for it in self._items]
+
+        self._items.sort(key=lambda it: keys[it.id][k], reverse=self.descending)
+        if self.group_mode != "none":
+            g = _GROUP_KEY[self.group_mode]
+            # Stable, so the order within each group is kept
+            self._items.sort(key=lambda it: keys[it.id][g])
+        # Same items, new rows: only the row index needs rebuilding
+        self._row_by_id = {it.id: i for i, it in enumerate(self._items)}
+
+        self.changePersistentIndexList(
+            persistent, [self.index(self._row_by_id[i], 0) for i in persistent_ids]
+        )
+        self.layoutChanged.emit()
+
+        after = [it.id for it in self._items]
+        if after != before:
+            self.reordered.emit(after)
+
+    def group_label(self, item: StationItem) -> Optional[str]:
+        if self.group_mode == "type":
+            return item.kind or item.item_type.value
+        if self.group_mode == "folder":
+            return os.path.dirname(item.path) if item.item_type == ItemType.FILE else "Pasted"
+        return None
+
+    def set_missing(self, item_id: str, missing: bool) -> None:
+        if missing == (item_id in self._missing) or item_id not in self._row_by_id:
+            return
+        if missing:
+            self._missing.add(item_id)
+        else:
+            self._missing.discard(item_id)
+        self.item_changed(item_id)
+
+    def update_path(self, item_id: str, path: str) -> None:
+        """Point an item at a new path (e.g. after a rename), keeping the path index in step."""
+        item = self.get(item_id)
+        if item is None:
+            return
+        if item.item_type == ItemType.FILE:
+            self._forget_path(item_id)
+            key = path_key(path)
+            if key not in self._id_by_path:
+                self._index_path(item_id, key)
+        item.path = path
+        self.item_changed(item_id)
+
+    def set_duplicate_groups(self, groups: Iterable[List[str]]) -> None:
+        """Flag every item of each group after the first as a duplicate of the first."""
+        old = self._duplicate_of
+        self._duplicate_of = {}
+        for ids in groups:
+            ids = sorted((i for i in ids if i in self._row_by_id), key=self._row_by_id.__getitem__)
+            for i in ids[1:]:
+                self._duplicate_of[i] = ids[0]
+        for item_id in old.keys() | self._duplicate_of.keys():
+            if old.get(item_id) != self._duplicate_of.get(item_id):
+                self.item_changed(item_id)
+
+    def remove_item(self, item_id: str) -> bool:
+        return self.remove_items([item_id]) == 1
+
+    def remove_items(self, item_ids: Iterable[str]) -> int:
+        """Remove many rows in one go; returns how many were removed."""
+        rows = sorted({self._row_by_id[i] for i in item_ids if i in self._row_by_id})
+        if not rows:
+            return 0
+
+        # Group into contiguous runs so each run is a single removal
+        runs = _runs(rows)
+
+        if len(runs) > 16:
+            # Scattered rows: one reset beats many row shifts
+            doomed = set(rows)
+            for r in rows:
+                self._forget(self._items[r])
+            self.beginResetModel()
+            self._items[:] = [it for i, it in enumerate(self._items) if i not in doomed]
+            self._reindex()
+            self.endResetModel()
+        else:
+            for first, last in reversed(runs):
+                self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+                for it in self._items[first:last + 1]:
+                    del self._row_by_id[it.id]
+                    self._forget(it)
+                del self._items[first:last + 1]
+                self._reindex(first)
+                self.endRemoveRows()
+        return len(rows)
+
+    def _forget(self, item: StationItem) -> None:
+        self._keys.pop(item.id, None)
+        self._duplicate_of.pop(item.id, None)
+        self._missing.discard(item.id)
+        self._forget_path(item.id)
+
+    def _forget_path(self, item_id: str) -> None:
+        key = self._key_by_id.pop(item_id, None)
+        if key is not None and self._id_by_path.get(key) == item_id:
+            del self._id_by_path[key]
+
+    def item_changed(self, item_id: str) -> None:
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        keys = sort_keys(self._items[row])
+        old = self._keys.get(item_id)
+        self._keys[item_id] = keys
+        if old is not None and not self._sort_timer.isActive():
+            # Re-sort only when a key we're ordering by actually moved
+            used = [_SORT_KEY[self.sort_mode]]
+            if self.group_mode != "none":
+                used.append(_GROUP_KEY[self.group_mode])
+            if any(old[k] != keys[k] for k in used):
+                self._sort_timer.start(0)
+        idx = self.index(row, 0)
+        self.dataChanged.emit(idx, idx)
+
+    def rows_changed(self, rows: Iterable[int], roles: Iterable[int] = ()) -> None:
+        """Emit dataChanged for rows, one signal per contiguous run."""
+        for first, last in _runs(sorted(rows)):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, 0), list(roles))
+
+
+class ShelfProxyModel(QtCore.QSortFilterProxyModel):
+    """
+    Filtered view of a ShelfItemModel for the search box.
+
+    The TrigramIndex follows the source model's row signals. A query's hits
+    are diffed against the previous ones and only rows whose verdict flipped
+    are sent back through the dynamic filter (as FilterRole changes), so a
+    keystroke that narrows a result re-checks a handful of rows, not all.
+    """
+
+    # Past this many runs of flipped rows one full re-filter is cheaper
+    MAX_RUNS = 64
+
+    def __init__(self, source: ShelfItemModel, parent=None) -> None:
+        super().__init__(parent)
+        self.search_index = TrigramIndex()
+        self._matches: Optional[Set[str]] = None
+        self._query = ""
+        self._source = source
+        self.setFilterRole(FilterRole)
+        self.setSourceModel(source)
+
+        source.rowsInserted.connect(self._on_rows_inserted)
+        source.rowsAboutToBeRemoved.connect(self._on_rows_removed)
+        source.modelReset.connect(self._on_model_reset)
+        source.dataChanged.connect(self._on_data_changed)
+        self._on_rows_inserted(QtCore.QModelIndex(), 0, source.rowCount() - 1)
+
+    def set_filter_text(self, text: str) -> None:
+        self._query = text
+        self._apply(self.search_index.search(text))
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        m = self._matches
+        return m is None or self._source._items[source_row].id in m
+
+    def _apply(self, matches: Optional[Set[str]]) -> None:
+        old = self._matches
+        if matches == old:
+            return
+        self._matches = matches
+        if old is None or matches is None:
+            # Filter switched on or off: the rows outside the one hit set flip
+            hits = matches if old is None else old
+            rows = [r for r, it in enumerate(self._source._items) if it.id not in hits]
+        else:
+            row_of = self._source.row_of
+            rows = [r for r in map(row_of, old ^ matches) if r >= 0]
+        rows.sort()
+        if len(_runs(rows)) > self.MAX_RUNS:
+            self.invalidateFilter()
+        else:
+            self._source.rows_changed(rows, [FilterRole])
+
+    def _requery(self) -> None:
+        # New or changed items must be checked against the active filter.
+        # The proxy has already filtered them by the time our slots run.
+        if self._matches is not None:
+            self._apply(self.search_index.search(self._query))
+
+    def _on_rows_inserted(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        for row in range(first, last + 1):
+            self.search_index.add(self._source.item_at(row))
+        self._requery()
+
+    def _on_rows_removed(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        for row in range(first, last + 1):
+            self.search_index.remove(self._source.item_at(row).id)
+
+    def _on_model_reset(self) -> None:
+        self.search_index.retain(it.id for it in self._source._items)
+        self._requery()
+
+    def _on_data_changed(self, top_left: QtCore.QModelIndex, bottom_right: QtCore.QModelIndex,
+                         roles=()) -> None:
+        if list(roles) == [FilterRole]:
+            return  # our own re-filter
+        changed = False
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            item = self._source.item_at(row)
+            if item is not None and self.search_index.add(item):
+                changed = True
+        if changed:
+            self._requery()
+
+
+class ShelfItemDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints one shelf row: thumbnail, name, path and the remove / lock buttons.
+
+    Nothing is instantiated per item, so the cost scales with the visible rows.
+    """
+
+    HIT_NONE = ""
+    HIT_REMOVE = "remove"
+    HIT_LOCK = "lock"
+
+    def __init__(self, thumbnails: ThumbnailLoader, parent=None) -> None:
+        super().__init__(parent)
+        self.thumbnails = thumbnails
+        self._hover_pos: Optional[QtCore.QPoint] = None
+
+        self._name_font = QtGui.QFont()
+        self._name_font.setWeight(QtGui.QFont.DemiBold)
+        self._path_font = QtGui.QFont()
+        self._path_font.setPixelSize(11)
+        self._remove_font = QtGui.QFont()
+        self._remove_font.setPixelSize(14)
+        self._remove_font.setWeight(QtGui.QFont.Bold)
+        # Ensure emoji is visible
+        self._lock_font = QtGui.QFont("Segoe UI Emoji")
+        self._lock_font.setPointSize(10)
+
+    def set_hover_pos(self, pos: Optional[QtCore.QPoint]) -> None:
+        self._hover_pos = pos
+
+    # -------- geometry --------
+    @staticmethod
+    def card_rect(rect: QtCore.QRect) -> QtCore.QRect:
+        # Anchored to the bottom so a group header can sit above the card
+        top = rect.y() + rect.height() - ROW_SPACING - ROW_HEIGHT
+        return QtCore.QRect(rect.x(), top, rect.width(), ROW_HEIGHT)
+
+    @classmethod
+    def remove_rect(cls, rect: QtCore.QRect) -> QtCore.QRect:
+        card = cls.card_rect(rect)
+        return QtCore.QRect(card.right() - 8 - 26 + 1, card.y() + 8, 26, 20)
+
+    @classmethod
+    def lock_rect(cls, rect: QtCore.QRect) -> QtCore.QRect:
+        r = cls.remove_rect(rect)
+        return QtCore.QRect(r.x(), r.bottom() + 1 + 6, 26, 26)
+
+    def hit_test(self, rect: QtCore.QRect, pos: QtCore.QPoint) -> str:
+        if self.remove_rect(rect).contains(pos):
+            return self.HIT_REMOVE
+        if self.lock_rect(rect).contains(pos):
+            return self.HIT_LOCK
+        return self.HIT_NONE
+
+    # -------- painting --------
+    @staticmethod
+    def group_header(index: QtCore.QModelIndex) -> Optional[str]:
+        """Group label if index is the first visible row of its group."""
+        label = index.data(GroupRole)
+        if label is None:
+            return None
+        if index.row() > 0 and index.sibling(index.row() - 1, 0).data(GroupRole) == label:
+            return None
+        return label
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        h = ROW_HEIGHT + ROW_SPACING
+        if self.group_header(index) is not None:
+            h += GROUP_HEADER_HEIGHT
+        return QtCore.QSize(320, h)
+
+    @metrics.timed("shelf.paint_row")
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> None:
+        item: StationItem = index.data(ItemRole)
+        if item is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        painter.setPen(QtCore.Qt.NoPen)
+
+        card = self.card_rect(option.rect)
+        header = self.group_header(index)
+        if header is not None:
+            painter.setFont(self._path_font)
+            painter.setPen(QtGui.QColor(255, 255, 255, 160))
+            fm = QtGui.QFontMetrics(self._path_font)
+            header_rect = QtCore.QRect(card.x() + 4, option.rect.y(), card.width() - 8, card.y() - option.rect.y())
+            painter.drawText(
+                header_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+                fm.elidedText(header, QtCore.Qt.ElideMiddle, header_rect.width()),
+            )
+            painter.setPen(QtCore.Qt.NoPen)
+        selected = bool(option.state & QtWidgets.QStyle.State_Selected)
+        painter.setBrush(QtGui.QColor(255, 255, 255, 70 if selected else 35))
+        painter.drawRoundedRect(card, 10, 10)
+
+        # Thumbnail
+        thumb_rect = QtCore.QRect(card.x() + 8, card.y() + (ROW_HEIGHT - THUMB_SIZE) // 2, THUMB_SIZE, THUMB_SIZE)
+        painter.setBrush(QtGui.QColor(0, 0, 0, 60))
+        painter.drawRoundedRect(thumb_rect, 8, 8)
+        # Never decode here: paint the placeholder until the loader delivers
+        pm = self.thumbnails.pixmap(item.id, item.thumbnail_path)
+        if pm is not None:
+            clip = QtGui.QPainterPath()
+            clip.addRoundedRect(QtCore.QRectF(thumb_rect), 8, 8)
+            painter.setClipPath(clip)
+            painter.drawPixmap(thumb_rect, pm)
+            painter.setClipping(False)
+
+        # Text
+        remove_r = self.remove_rect(option.rect)
+        text_x = thumb_rect.right() + 1 + 10
+        text_w = max(0, remove_r.x() - 10 - text_x)
+
+        painter.setFont(self._name_font)
+        painter.setPen(QtGui.QColor(255, 255, 255))
+        fm = QtGui.QFontMetrics(self._name_font)
+        name_rect = QtCore.QRect(text_x, card.y() + 8, text_w, fm.height())
+        painter.drawText(
+            name_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+            fm.elidedText(item.display_name, QtCore.Qt.ElideRight, text_w),
+        )
+
+        painter.setFont(self._path_font)
+        fm = QtGui.QFontMetrics(self._path_font)
+        path_rect = QtCore.QRect(text_x, name_rect.bottom() + 1 + 4, text_w, fm.height())
+        dup_of = index.data(DuplicateOfRole)
+        if index.data(MissingRole):
+            painter.setPen(QtGui.QColor(255, 110, 110, 220))
+            sub = f"Missing: {item.path}"
+        elif dup_of:
+            painter.setPen(QtGui.QColor(255, 200, 90, 200))
+            sub = f"Same content as {dup_of}"
+        else:
+            painter.setPen(QtGui.QColor(255, 255, 255, 140))
+            sub = " · ".join(p for p in (format_size(item.size), item.kind, item.path or "Not saved to disk yet") if p)
+        painter.drawText(
+            path_rect, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+            fm.elidedText(sub, QtCore.Qt.ElideMiddle, text_w),
+        )
+
+        # "X" remove button (always allowed, even if locked)
+        hover = self._hover_pos
+        self._paint_button(
+            painter, remove_r, "×", self._remove_font,
+            QtGui.QColor(255, 80, 80, 80) if hover is not None and remove_r.contains(hover) else None,
+        )
+
+        # Lock button uses 🔒 / 🔓
+        lock_r = self.lock_rect(option.rect)
+        self._paint_button(
+            painter, lock_r, "🔒" if item.is_pinned else "🔓", self._lock_font,
+            QtGui.QColor(255, 255, 255, 35) if hover is not None and lock_r.contains(hover) else None,
+        )
+
+        painter.restore()
+
+    def _paint_button(self, painter: QtGui.QPainter, rect: QtCore.QRect, text: str,
+                      font: QtGui.QFont, hover_bg: Optional[QtGui.QColor]) -> None:
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 70), 1))
+        painter.setBrush(hover_bg if hover_bg is not None else QtGui.QColor(0, 0, 0, 15))
+        painter.drawRoundedRect(QtCore.QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(255, 255, 255))
+        painter.drawText(rect, QtCore.Qt.AlignCenter, text)
+
+    def helpEvent(self, event: QtGui.QHelpEvent, view: QtWidgets.QAbstractItemView,
+                  option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> bool:
+        item: StationItem = index.data(ItemRole)
+        if item is not None and event.type() == QtCore.QEvent.ToolTip:
+            hit = self.hit_test(option.rect, event.pos())
+            if hit == self.HIT_REMOVE:
+                tip = "Remove from shelf"
+            elif hit == self.HIT_LOCK:
+                tip = "Locked (won't auto-remove)" if item.is_pinned else "Unlocked"
+            else:
+                tip = f"{item.display_name}\n{item.path}"
+                if item.mtime is not None:
+                    details = ", ".join(p for p in (item.kind, format_size(item.size)) if p)
+                    tip += f"\n{details}, modified {format_mtime(item.mtime)}"
+                if item.encode_ms is not None:
+                    tip += f"\nEncoded in {item.encode_ms:.0f} ms, {item.encoded_bytes or 0:,} bytes"
+                if index.data(MissingRole):
+                    tip += "\nFile no longer exists"
+                dup_of = index.data(DuplicateOfRole)
+                if dup_of:
+                    tip += f"\nSame content as {dup_of}"
+            QtWidgets.QToolTip.showText(event.globalPos(), tip, view)
+            return True
+        return super().helpEvent(event, view, option, index)
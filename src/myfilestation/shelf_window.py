@@ -1,94 +1,153 @@
 import os
-from typing import List
+from typing import Callable, List, Optional, Set, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
-import win32api
-import win32con
-
+from . import metrics
+from .drag_tracker import DragSessionTracker
+from .duplicates import DuplicateScanner
+from .file_watcher import FileWatcher
+from .image_encoder import EncodeResult, ImageEncoder
+from .ingest import IngestJob, file_item, parse_patterns
+from .metadata import apply_state
 from .models import StationItem, ItemType
-from .settings import AppSettings
+from .screens import screen_geometry
+from .temp_store import ContentStore, TempPayloads
+from .session import SessionStore
+from .settings import AppSettings, get_appdata_dir
+from .shelf_model import (
+    GROUP_MODES,
+    SORT_MODES,
+    ItemRole,
+    ShelfItemDelegate,
+    ShelfItemModel,
+    ShelfProxyModel,
+    THUMB_SIZE,
+)
+from .thumbnail_cache import ThumbnailCache
+from .thumbnails import ThumbnailLoader
 from .utils import (
-    is_image_file,
-    create_temp_text_file,
-    create_temp_image_file_from_qimage,
     open_with_default_app,
     open_in_explorer_select,
 )
 
 
-class ElidedLabel(QtWidgets.QLabel):
-    """QLabel that automatically adds '...' when text is too long."""
-    def __init__(self, text: str = "", parent=None, elide_mode=QtCore.Qt.ElideRight):
-        super().__init__(text, parent)
-        self._full_text = text or ""
-        self._elide_mode = elide_mode
-        self.setMinimumWidth(0)
-        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
-
-    def set_full_text(self, text: str) -> None:
-        self._full_text = text or ""
-        self._update_elide()
+# (items, callback): calls callback([(item, path), ...]) once the items have files
+PathsRequest = Callable[[List[StationItem], Callable[[List[Tuple[StationItem, str]]], None]], None]
 
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        self._update_elide()
 
-    def _update_elide(self) -> None:
-        fm = self.fontMetrics()
-        w = max(0, self.width())
-        super().setText(fm.elidedText(self._full_text, self._elide_mode, w))
+class ShelfListView(QtWidgets.QListView):
+    request_remove_items = QtCore.Signal(object)       # List[StationItem]
+    request_force_remove_item = QtCore.Signal(object)  # StationItem
+    request_toggle_lock = QtCore.Signal(object)        # StationItem
+    dropped_mime = QtCore.Signal(object)               # QMimeData
 
-
-class ShelfListWidget(QtWidgets.QListWidget):
-    request_remove_item = QtCore.Signal(object)  # StationItem
-    dropped_mime = QtCore.Signal(object)         # QMimeData
-
-    def __init__(self, settings: AppSettings) -> None:
+    def __init__(self, settings: AppSettings, thumbnails: ThumbnailLoader, with_paths: PathsRequest) -> None:
         super().__init__()
         self.settings = settings
+        # Resolves items to real files, writing in-memory temp items out first
+        self.with_paths = with_paths
 
         self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
-        self.setDragEnabled(True)
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
 
         self.setAcceptDrops(True)
         self.setDropIndicatorShown(True)
         self.setDefaultDropAction(QtCore.Qt.CopyAction)
         self.viewport().setAcceptDrops(True)
 
+        self.delegate = ShelfItemDelegate(thumbnails, self)
+        self.setItemDelegate(self.delegate)
+
         self._drag_start_pos = QtCore.QPoint()
+        self._press_on_button = False
+        # Drag-out waiting for selected images to be written out
+        self._drag_pending = False
+
+    def station_item_at(self, pos: QtCore.QPoint) -> Optional[StationItem]:
+        idx = self.indexAt(pos)
+        if not idx.isValid():
+            return None
+        return idx.data(ItemRole)
+
+    def selected_station_items(self) -> List[StationItem]:
+        rows = sorted(self.selectionModel().selectedRows(), key=lambda i: i.row())
+        return [s for s in (i.data(ItemRole) for i in rows) if s is not None]
 
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
+        pos = event.position().toPoint()
+        idx = self.indexAt(pos)
+
         if event.button() == QtCore.Qt.MiddleButton:
-            item = self.itemAt(event.position().toPoint())
-            if item:
-                station_item = item.data(QtCore.Qt.UserRole)
-                if station_item and not station_item.is_pinned:
-                    self.request_remove_item.emit(station_item)
+            station_item = idx.data(ItemRole) if idx.isValid() else None
+            if station_item and not station_item.is_pinned:
+                self.request_remove_items.emit([station_item])
             return
 
-        self._drag_start_pos = event.position().toPoint()
+        self._press_on_button = False
+        if idx.isValid() and event.button() == QtCore.Qt.LeftButton:
+            hit = self.delegate.hit_test(self.visualRect(idx), pos)
+            if hit == ShelfItemDelegate.HIT_REMOVE:
+                self._press_on_button = True
+                self.request_force_remove_item.emit(idx.data(ItemRole))
+                return
+            if hit == ShelfItemDelegate.HIT_LOCK:
+                self._press_on_button = True
+                self.request_toggle_lock.emit(idx.data(ItemRole))
+                return
+
+        self._drag_start_pos = pos
         super().mousePressEvent(event)
 
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
+        self._drag_pending = False
+        if self._press_on_button:
+            self._press_on_button = False
+            return
+        super().mouseReleaseEvent(event)
+
+    def leaveEvent(self, event: QtCore.QEvent) -> None:
+        self.delegate.set_hover_pos(None)
+        self.viewport().update()
+        super().leaveEvent(event)
+
+    def _update_hover(self, pos: QtCore.QPoint) -> None:
+        self.delegate.set_hover_pos(pos)
+        idx = self.indexAt(pos)
+        if idx.isValid():
+            self.viewport().update(self.visualRect(idx))
+
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
+        self._update_hover(event.position().toPoint())
+
+        if self._press_on_button:
+            return
+
         if not (event.buttons() & QtCore.Qt.LeftButton):
             return super().mouseMoveEvent(event)
 
         if (event.position().toPoint() - self._drag_start_pos).manhattanLength() < 6:
             return super().mouseMoveEvent(event)
 
-        selected = self.selectedItems()
-        paths = []
-        station_items = []
-
-        for it in selected:
-            s = it.data(QtCore.Qt.UserRole)
-            if s and os.path.exists(s.path):
-                paths.append(s.path)
-                station_items.append(s)
-
-        if not paths:
+        if self._drag_pending:
+            return
+        self._drag_pending = True
+        metrics.inc("shelf.drag_out")
+        with metrics.span("shelf.drag_out_prepare"):
+            self.with_paths(self.selected_station_items(), self._start_drag)
+
+    def _start_drag(self, resolved: List[Tuple[StationItem, str]]) -> None:
+        # Images still encoding when the drag began arrive here later: only
+        # drag if the button is still held
+        if not self._drag_pending:
+            return
+        self._drag_pending = False
+        if not resolved or not (QtGui.QGuiApplication.mouseButtons() & QtCore.Qt.LeftButton):
             return
+        paths = [p for _, p in resolved]
+        station_items = [s for s, _ in resolved]
 
         mime = QtCore.QMimeData()
         mime.setUrls([QtCore.QUrl.fromLocalFile(p) for p in paths])
@@ -99,9 +158,9 @@ class ShelfListWidget(QtWidgets.QListWidget):
 
         # Remove-after-drag-out: ONLY remove UNLOCKED items
         if self.settings.remove_after_drag_out and result != QtCore.Qt.IgnoreAction:
-            for s in station_items:
-                if not s.is_pinned:  # locked items stay
-                    self.request_remove_item.emit(s)
+            unlocked = [s for s in station_items if not s.is_pinned]  # locked items stay
+            if unlocked:
+                self.request_remove_items.emit(unlocked)
 
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent) -> None:
         m = event.mimeData()
@@ -128,11 +187,51 @@ class ShelfListWidget(QtWidgets.QListWidget):
 
 class ShelfWindow(QtWidgets.QWidget):
     hidden_signal = QtCore.Signal()
+    # Emitted after the shelf itself changed a setting, so it can be saved
+    settings_changed = QtCore.Signal()
 
-    def __init__(self, settings: AppSettings) -> None:
+    # Drops smaller than this finish too fast to be worth a progress bar
+    PROGRESS_MIN_ITEMS = 200
+    # Nor is any ingest that is over before this (no flash on a plain drop)
+    PROGRESS_DELAY_MS = 150
+
+    def __init__(self, settings: AppSettings, tracker: Optional[DragSessionTracker] = None) -> None:
         super().__init__()
         self.settings = settings
         self.items: List[StationItem] = []
+        self.model = ShelfItemModel(self.items, self)
+        self.model.set_sort(settings.sort_by, settings.sort_descending, settings.group_by)
+        # What the list shows: the model narrowed by the search box
+        self.proxy = ShelfProxyModel(self.model, self)
+
+        self.thumbnail_cache = ThumbnailCache(
+            os.path.join(get_appdata_dir(), "thumbcache"),
+            self.settings.thumbnail_cache_mb * 1024 * 1024,
+        )
+        self.thumbnails = ThumbnailLoader(THUMB_SIZE, self.thumbnail_cache, self)
+        self.thumbnails.thumbnail_ready.connect(self.model.item_changed)
+
+        # Pasted text/images live here until something needs a real file
+        self.payloads = TempPayloads()
+        # ...and then in a content-addressed, reference-counted temp store
+        self.store = ContentStore()
+        self.encoder = ImageEncoder(self.settings, self.store, self)
+        self.encoder.encoded.connect(self._on_image_encoded)
+        # with_paths() calls waiting on image encodes: (pending ids, items, callback)
+        self._path_waiters: List[Tuple[Set[str], List[StationItem], Callable]] = []
+
+        # Existence of shelved files, kept current without touching the disk on drag
+        self.watcher = FileWatcher(parent=self)
+        self.watcher.changed.connect(self._on_files_changed)
+        self.watcher.moved.connect(self._on_file_moved)
+
+        # Optional content-hash pass flagging identical files at different paths
+        self.duplicates = DuplicateScanner(self)
+        self.duplicates.found.connect(self.model.set_duplicate_groups)
+        self._dupe_timer = QtCore.QTimer(self)
+        self._dupe_timer.setSingleShot(True)
+        self._dupe_timer.setInterval(1000)
+        self._dupe_timer.timeout.connect(self._scan_duplicates)
 
         self.setAcceptDrops(True)
         self.setWindowFlags(
@@ -143,6 +242,12 @@ class ShelfWindow(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground, True)
 
         self._shown_by_edge_drag = False
+        self.screens = screen_geometry()
+        self._ingest_jobs: List[IngestJob] = []
+        self._progress_delay = QtCore.QTimer(self)
+        self._progress_delay.setSingleShot(True)
+        self._progress_delay.setInterval(self.PROGRESS_DELAY_MS)
+        self._progress_delay.timeout.connect(self._update_ingest_progress)
 
         self._build_ui()
         self._setup_shortcuts()
@@ -150,41 +255,69 @@ class ShelfWindow(QtWidgets.QWidget):
         self._anim = QtCore.QPropertyAnimation(self, b"windowOpacity")
         self._anim.setDuration(180)
 
-        # Drag-cancel watchdog
-        self._watchdog = QtCore.QTimer(self)
-        self._watchdog.setInterval(80)
-        self._watchdog.timeout.connect(self._watch_drag_cancel)
+        # Auto-hide when the drag that summoned us ends without a drop
+        self.tracker = tracker
+        if tracker is not None:
+            tracker.drag_cancelled.connect(self._on_drag_finished)
+            tracker.drag_ended.connect(self._on_drag_finished)
 
         self.setWindowOpacity(0.0)
         self.hide()
         self.reposition()
 
+        # Restore the previous shelf in the background, then keep journaling
+        self._restore_pending: List[StationItem] = []
+        self.session = SessionStore(get_appdata_dir(), parent=self)
+        self.session.restored.connect(self._on_session_restored)
+        self.model.reordered.connect(self.session.record_reorder)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.session.close)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.encoder.shutdown)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.store.stop_sweeper)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.duplicates.shutdown)
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.watcher.shutdown)
+        self.session.start()
+
+    def _on_session_restored(self, items: List[StationItem]) -> None:
+        for it in items:
+            if it.item_type != ItemType.FILE:
+                self.store.acquire(it.id, it.path)
+        # Only now do we know every file the shelf still needs
+        self.store.start_sweeper(
+            10 * 60,
+            self.settings.temp_store_max_mb * 1024 * 1024,
+            self.settings.temp_store_max_age_days * 86400,
+        )
+        self._restore_pending = list(items)
+        self._restore_next_chunk()
+
+    def _restore_next_chunk(self) -> None:
+        # Insert in chunks so the event loop keeps painting between them
+        chunk = self._restore_pending[:500]
+        del self._restore_pending[:500]
+        self._watch(self.model.append_items(chunk))
+        if self._restore_pending:
+            QtCore.QTimer.singleShot(0, self._restore_next_chunk)
+        else:
+            self.model.sort_items()
+            self.schedule_duplicate_scan()
+
     def hideEvent(self, event: QtGui.QHideEvent) -> None:
         super().hideEvent(event)
-        self._watchdog.stop()
         self._shown_by_edge_drag = False
         self.hidden_signal.emit()
 
-    def _is_left_button_down(self) -> bool:
-        return (win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000) != 0
-
-    def _watch_drag_cancel(self) -> None:
+    def _on_drag_finished(self, _pos: QtCore.QPoint) -> None:
         if not self._shown_by_edge_drag:
             return
-        if not self._is_left_button_down():
-            if self.list.count() == 0:
-                self.hide_soft()
-            self._shown_by_edge_drag = False
-            self._watchdog.stop()
+        self._shown_by_edge_drag = False
+        if self.model.rowCount() == 0 and not self._ingest_jobs:
+            self.hide_soft()
 
     def reposition(self) -> None:
-        screen = QtGui.QGuiApplication.screenAt(QtGui.QCursor.pos())
-        if not screen:
-            screen = QtGui.QGuiApplication.primaryScreen()
-        if not screen:
+        r = self.screens.available_geometry_at(QtGui.QCursor.pos())
+        if r is None:
             return
 
-        r = screen.availableGeometry()
         margin = 8
 
         desired_w = 380
@@ -210,7 +343,6 @@ class ShelfWindow(QtWidgets.QWidget):
 
     def show_soft(self) -> None:
         self._shown_by_edge_drag = False
-        self._watchdog.stop()
 
         self.reposition()
         self.show()
@@ -224,7 +356,6 @@ class ShelfWindow(QtWidgets.QWidget):
 
     def show_from_edge_drag(self) -> None:
         self._shown_by_edge_drag = True
-        self._watchdog.start()
 
         self.reposition()
         self.show()
@@ -273,24 +404,70 @@ class ShelfWindow(QtWidgets.QWidget):
         header.addWidget(title)
         header.addStretch(1)
 
+        self.filter_edit = QtWidgets.QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter…")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setFixedHeight(28)
+        self.filter_edit.setStyleSheet("""
+            QLineEdit { background: rgba(255,255,255,30); color: white;
+                        border: 0px; border-radius: 6px; padding: 0 6px; }
+        """)
+        self.filter_edit.textChanged.connect(self.proxy.set_filter_text)
+        header.addWidget(self.filter_edit, 2)
+
+        self.btn_sort = QtWidgets.QToolButton()
+        self.btn_sort.setText("⇅")
+        self.btn_sort.setToolTip("Sort and group")
+        self.btn_sort.setFixedSize(28, 28)
+        self.btn_sort.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.btn_sort.setMenu(self._build_sort_menu())
+        header.addWidget(self.btn_sort)
+
         self.btn_close = QtWidgets.QPushButton("✕")
         self.btn_close.setFixedSize(36, 28)
         self.btn_close.clicked.connect(self.hide_soft)
         header.addWidget(self.btn_close)
         card_layout.addLayout(header)
 
-        self.list = ShelfListWidget(self.settings)
+        self.list = ShelfListView(self.settings, self.thumbnails, self.with_paths)
+        self.list.setModel(self.proxy)
+        self.list.setUniformItemSizes(self.model.group_mode == "none")
         self.list.setStyleSheet("""
-            QListWidget { background: transparent; border: 0px; }
-            QListWidget::item { margin-bottom: 8px; }
+            QListView { background: transparent; border: 0px; }
         """)
-        self.list.request_remove_item.connect(self.remove_item)
+        self.list.request_remove_items.connect(self.remove_items)
+        self.list.request_force_remove_item.connect(self.force_remove_item)
+        self.list.request_toggle_lock.connect(self.toggle_lock)
         self.list.dropped_mime.connect(self._handle_dropped_mime)
 
+        self.list.selectionModel().selectionChanged.connect(
+            lambda *_: self.prefetch_paths(self.list.selected_station_items())
+        )
+        # Removing scattered rows resets the model; keep the selection across it
+        self._kept_selection: Tuple[List[str], Optional[str]] = ([], None)
+        self.model.modelAboutToBeReset.connect(self._remember_selection)
+        self.model.modelReset.connect(self._restore_selection)
+
         self.list.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.list.customContextMenuRequested.connect(self._show_context_menu)
         card_layout.addWidget(self.list, 1)
 
+        # Progress for large drops; hidden otherwise
+        self.progress_row = QtWidgets.QWidget()
+        progress_layout = QtWidgets.QHBoxLayout(self.progress_row)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        progress_layout.setSpacing(8)
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setTextVisible(True)
+        self.progress.setFixedHeight(18)
+        self.btn_cancel_ingest = QtWidgets.QToolButton()
+        self.btn_cancel_ingest.setText("Cancel")
+        self.btn_cancel_ingest.clicked.connect(self.cancel_ingest)
+        progress_layout.addWidget(self.progress, 1)
+        progress_layout.addWidget(self.btn_cancel_ingest)
+        self.progress_row.hide()
+        card_layout.addWidget(self.progress_row)
+
         # Footer: ONLY buttons
         footer = QtWidgets.QHBoxLayout()
         footer.setContentsMargins(0, 0, 0, 0)
@@ -308,18 +485,72 @@ class ShelfWindow(QtWidgets.QWidget):
         card_layout.addLayout(footer)
         root.addWidget(self.card)
 
+    def _build_sort_menu(self) -> QtWidgets.QMenu:
+        menu = QtWidgets.QMenu(self)
+        labels = {
+            "added": "Date added", "name": "Name", "size": "Size", "type": "Type",
+            "none": "No grouping", "folder": "Folder",
+        }
+
+        sort_group = QtGui.QActionGroup(menu)
+        for mode in SORT_MODES:
+            a = menu.addAction(labels[mode])
+            a.setCheckable(True)
+            a.setChecked(mode == self.model.sort_mode)
+            a.setActionGroup(sort_group)
+            a.triggered.connect(lambda _=False, m=mode: self.set_sort(sort_by=m))
+
+        a_desc = menu.addAction("Descending")
+        a_desc.setCheckable(True)
+        a_desc.setChecked(self.model.descending)
+        a_desc.toggled.connect(lambda on: self.set_sort(descending=on))
+        menu.addSeparator()
+
+        group_group = QtGui.QActionGroup(menu)
+        for mode in GROUP_MODES:
+            a = menu.addAction("Group by " + labels[mode].lower() if mode != "none" else labels[mode])
+            a.setCheckable(True)
+            a.setChecked(mode == self.model.group_mode)
+            a.setActionGroup(group_group)
+            a.triggered.connect(lambda _=False, m=mode: self.set_sort(group_by=m))
+        return menu
+
+    def set_sort(self, sort_by: Optional[str] = None, descending: Optional[bool] = None,
+                 group_by: Optional[str] = None) -> None:
+        s = self.settings
+        if sort_by is not None:
+            s.sort_by = sort_by
+        if descending is not None:
+            s.sort_descending = descending
+        if group_by is not None:
+            s.group_by = group_by
+        self.model.set_sort(s.sort_by, s.sort_descending, s.group_by)
+        # Group headers make rows of two heights
+        self.list.setUniformItemSizes(self.model.group_mode == "none")
+        self.settings_changed.emit()
+
     def _setup_shortcuts(self) -> None:
         QtGui.QShortcut(QtGui.QKeySequence("Ctrl+V"), self, activated=self.import_from_clipboard)
         QtGui.QShortcut(QtGui.QKeySequence("Ctrl+C"), self, activated=self.export_selection_to_clipboard)
         QtGui.QShortcut(QtGui.QKeySequence("Space"), self, activated=self.preview_selected)
+        QtGui.QShortcut(QtGui.QKeySequence("Esc"), self, activated=self.cancel_ingest)
+        QtGui.QShortcut(QtGui.QKeySequence("Ctrl+F"), self, activated=self.filter_edit.setFocus)
 
+    @metrics.timed("shelf.drop")
     def _handle_dropped_mime(self, mime: QtCore.QMimeData) -> None:
+        if self.tracker is not None:
+            self.tracker.mark_dropped()
+        # Whatever was just dropped should be visible
+        self.filter_edit.clear()
+
         if mime.hasUrls():
-            for url in mime.urls():
-                if url.isLocalFile():
-                    self.add_file(url.toLocalFile())
+            # Holding Shift flips the "expand folder" drop mode for this drop
+            shift = bool(QtWidgets.QApplication.keyboardModifiers() & QtCore.Qt.ShiftModifier)
+            self.ingest_paths(
+                [u.toLocalFile() for u in mime.urls() if u.isLocalFile()],
+                expand_folders=self.settings.expand_dropped_folders != shift,
+            )
             self._shown_by_edge_drag = False
-            self._watchdog.stop()
             self.show_soft()
             return
 
@@ -328,7 +559,6 @@ class ShelfWindow(QtWidgets.QWidget):
             if txt and txt.strip():
                 self.add_temp_text(txt)
                 self._shown_by_edge_drag = False
-                self._watchdog.stop()
                 self.show_soft()
             return
 
@@ -337,184 +567,336 @@ class ShelfWindow(QtWidgets.QWidget):
             if isinstance(img, QtGui.QImage) and not img.isNull():
                 self.add_temp_image(img)
                 self._shown_by_edge_drag = False
-                self._watchdog.stop()
                 self.show_soft()
 
     def add_file(self, path: str) -> None:
+        existing = self.model.find_path(path)
+        if existing is not None:
+            # Already on the shelf: point at it instead of adding it twice
+            self.list.scrollTo(self.proxy.mapFromSource(self.model.index(self.model.row_of(existing), 0)))
+            return
         if not os.path.exists(path):
             return
-        name = os.path.basename(path)
-        thumb = path if is_image_file(path) else None
-        item = StationItem.new(ItemType.FILE, path, name, thumb)
-        self._append_item(item)
-
-    def add_temp_text(self, text: str) -> None:
-        p = create_temp_text_file(text)
-        name = os.path.basename(p)
-        item = StationItem.new(ItemType.TEXT_TEMP, p, name, None)
-        self._append_item(item)
+        self._append_item(file_item(path))
 
-    def add_temp_image(self, qimage: QtGui.QImage) -> None:
-        p = create_temp_image_file_from_qimage(qimage)
-        name = os.path.basename(p)
-        item = StationItem.new(ItemType.IMAGE_TEMP, p, name, p)
-        self._append_item(item)
+    # -------- duplicate content --------
+    def set_duplicate_detection(self, enabled: bool) -> None:
+        self.settings.detect_duplicate_content = enabled
+        if enabled:
+            self.schedule_duplicate_scan()
+        else:
+            self._dupe_timer.stop()
+            self.duplicates.cancel()
+            self.model.set_duplicate_groups([])
 
-    def _append_item(self, item: StationItem) -> None:
-        self.items.append(item)
-        lw_item = QtWidgets.QListWidgetItem()
-        lw_item.setData(QtCore.Qt.UserRole, item)
-        lw_item.setSizeHint(QtCore.QSize(320, 64))
-        widget = self._make_item_widget(item)
-        self.list.addItem(lw_item)
-        self.list.setItemWidget(lw_item, widget)
-
-    def _make_item_widget(self, item: StationItem) -> QtWidgets.QWidget:
-        w = QtWidgets.QWidget()
-        w.setStyleSheet("QWidget { background: rgba(255,255,255,35); border-radius: 10px; }")
-
-        # We'll use a grid to place a top-right "X" button
-        grid = QtWidgets.QGridLayout(w)
-        grid.setContentsMargins(8, 8, 8, 8)
-        grid.setHorizontalSpacing(10)
-        grid.setVerticalSpacing(4)
-
-        thumb = QtWidgets.QLabel()
-        thumb.setFixedSize(44, 44)
-        thumb.setStyleSheet("background: rgba(0,0,0,60); border-radius: 8px;")
-        if item.thumbnail_path and os.path.exists(item.thumbnail_path):
-            pm = QtGui.QPixmap(item.thumbnail_path)
-            if not pm.isNull():
-                thumb.setPixmap(
-                    pm.scaled(44, 44, QtCore.Qt.KeepAspectRatioByExpanding, QtCore.Qt.SmoothTransformation)
-                )
-        grid.addWidget(thumb, 0, 0, 2, 1)
-
-        name = ElidedLabel("", elide_mode=QtCore.Qt.ElideRight)
-        name.setStyleSheet("font-weight: 600;")
-        name.set_full_text(item.display_name)
-        name.setToolTip(item.display_name)
-
-        path = ElidedLabel("", elide_mode=QtCore.Qt.ElideMiddle)
-        path.setStyleSheet("color: rgba(255,255,255,140); font-size: 11px;")
-        path.set_full_text(item.path)
-        path.setToolTip(item.path)
-
-        grid.addWidget(name, 0, 1, 1, 1)
-        grid.addWidget(path, 1, 1, 1, 1)
-
-        # Right-side buttons container
-        btn_col = QtWidgets.QVBoxLayout()
-        btn_col.setContentsMargins(0, 0, 0, 0)
-        btn_col.setSpacing(6)
-
-        # "X" remove button (always allowed, even if locked)
-        remove_btn = QtWidgets.QToolButton()
-        remove_btn.setText("×")
-        remove_btn.setFixedSize(26, 20)
-        remove_btn.setToolTip("Remove from shelf")
-        remove_btn.setStyleSheet("""
-            QToolButton {
-                border: 1px solid rgba(255,255,255,70);
-                background: rgba(0,0,0,15);
-                border-radius: 6px;
-                font-size: 14px;
-                font-weight: 700;
-                padding: 0px;
-            }
-            QToolButton:hover {
-                background: rgba(255,80,80,80);
-            }
-        """)
-        remove_btn.clicked.connect(lambda: self.force_remove_item(item))
-
-        # Lock button uses 🔒 / 🔓 (force emoji font on Windows)
-        lock_btn = QtWidgets.QToolButton()
-        lock_btn.setCheckable(True)
-        lock_btn.setChecked(item.is_pinned)  # locked
-        lock_btn.setFixedSize(26, 26)
-        lock_btn.setStyleSheet("""
-            QToolButton {
-                border: 1px solid rgba(255,255,255,70);
-                background: rgba(0,0,0,15);
-                border-radius: 6px;
-                padding: 0px;
-            }
-            QToolButton:hover {
-                background: rgba(255,255,255,35);
-            }
-        """)
+    def schedule_duplicate_scan(self) -> None:
+        # Debounced: a burst of ingest batches triggers a single scan
+        if self.settings.detect_duplicate_content:
+            self._dupe_timer.start()
 
-        # Ensure emoji is visible
-        f = lock_btn.font()
-        f.setFamily("Segoe UI Emoji")
-        f.setPointSize(10)
-        lock_btn.setFont(f)
+    def _scan_duplicates(self) -> None:
+        self.duplicates.scan([(it.id, it.path) for it in self.items if it.item_type == ItemType.FILE])
 
-        def refresh_lock():
-            if lock_btn.isChecked():
-                lock_btn.setText("🔒")
-                lock_btn.setToolTip("Locked (won't auto-remove)")
-            else:
-                lock_btn.setText("🔓")
-                lock_btn.setToolTip("Unlocked")
+    # -------- bulk ingestion --------
+    def ingest_paths(self, paths: List[str], expand_folders: bool = False) -> None:
+        """Validate and add many paths without blocking the GUI thread."""
+        if not paths:
+            return
+        job = IngestJob(
+            paths,
+            expand_folders=expand_folders,
+            patterns=parse_patterns(self.settings.expand_folder_patterns),
+            limit=self.settings.expand_folder_limit,
+            parent=self,
+        )
+        job.batch_ready.connect(self._append_items)
+        job.progress.connect(self._update_ingest_progress)
+        job.finished.connect(lambda: self._ingest_finished(job))
+        if not self._ingest_jobs:
+            self._progress_delay.start()
+        self._ingest_jobs.append(job)
+        job.start()
+
+    def cancel_ingest(self) -> None:
+        for job in self._ingest_jobs:
+            job.cancel()
+
+    def _ingest_finished(self, job: IngestJob) -> None:
+        if job in self._ingest_jobs:
+            self._ingest_jobs.remove(job)
+        job.deleteLater()
+        self._update_ingest_progress()
+
+    def _update_ingest_progress(self, *_) -> None:
+        jobs = self._ingest_jobs
+        if not jobs:
+            self._progress_delay.stop()
+            self.progress_row.hide()
+            return
+        if self._progress_delay.isActive():
+            return
+        done = sum(j.done for j in jobs)
+        streaming = any(j.expand_folders for j in jobs)
+        if streaming:
+            # Folder walks don't know their size up front: show a busy bar
+            self.progress.setRange(0, 0)
+            self.progress.setFormat(f"Found {done} files")
+            self.progress_row.show()
+            return
 
-        def on_lock(checked: bool) -> None:
-            item.is_pinned = checked
-            refresh_lock()
+        total = sum(j.total for j in jobs)
+        if total < self.PROGRESS_MIN_ITEMS:
+            self.progress_row.hide()
+            return
+        self.progress.setRange(0, total)
+        self.progress.setValue(done)
+        self.progress.setFormat(f"Adding {done} / {total}")
+        self.progress_row.show()
 
-        lock_btn.toggled.connect(on_lock)
-        refresh_lock()
+    def add_temp_text(self, text: str) -> None:
+        first = next((ln.strip() for ln in text.splitlines() if ln.strip()), "Text")
+        name = first if len(first) <= 60 else first[:59] + "…"
+        item = StationItem.new(ItemType.TEXT_TEMP, "", name, None)
+        self.payloads.put_text(item.id, text)
+        self._append_item(item)
 
-        btn_col.addWidget(remove_btn, 0, QtCore.Qt.AlignRight | QtCore.Qt.AlignTop)
-        btn_col.addWidget(lock_btn, 0, QtCore.Qt.AlignRight)
-        btn_col.addStretch(1)
+    def add_temp_image(self, qimage: QtGui.QImage) -> None:
+        name = f"Image {qimage.width()}×{qimage.height()}"
+        item = StationItem.new(ItemType.IMAGE_TEMP, "", name, None)
+        self.payloads.put_image(item.id, qimage)
+        self.thumbnails.set_image_source(item.id, qimage)
+        self._append_item(item)
 
-        btn_wrap = QtWidgets.QWidget()
-        btn_wrap.setLayout(btn_col)
-        btn_wrap.setFixedWidth(32)
+    def ensure_path(self, item: StationItem) -> Optional[str]:
+        """
+        Real file for item, or None if there is none (yet), including files the
+        watcher saw disappear. Pasted text is written out on the spot; a pasted
+        image is queued for encoding and gets its file later (see with_paths).
+        """
+        if item.path:
+            return item.path if self.watcher.exists(item.id) else None
+
+        if item.item_type == ItemType.TEXT_TEMP:
+            text = self.payloads.text(item.id)
+            if text is None:
+                return None
+            item.path = self.store.put_text(item.id, text)
+        elif item.item_type == ItemType.IMAGE_TEMP:
+            img = self.payloads.image(item.id)
+            if img is not None:
+                # Joins a prefetch already in flight instead of encoding twice
+                self.encoder.submit(item.id, img)
+            return None
+        else:
+            return None
+
+        self._materialized(item)
+        return item.path
+
+    def _materialized(self, item: StationItem) -> None:
+        self.payloads.discard(item.id)
+        self.thumbnails.drop_image_source(item.id)
+        self.watcher.watch(item.id, item.path)
+        self.model.item_changed(item.id)
+        # Only items backed by a file are worth restoring
+        self.session.record_add([item])
+
+    def with_paths(self, items: List[StationItem],
+                   callback: Callable[[List[Tuple[StationItem, str]]], None]) -> None:
+        """
+        Call callback with (item, path) for every item that has or gets a file.
+        Unsaved images are encoded off the GUI thread first, so the callback may
+        run later; images that fail to encode are left out.
+        """
+        unsaved = [it for it in items
+                   if it.item_type == ItemType.IMAGE_TEMP and not it.path and it.id in self.payloads]
+        if not unsaved:
+            self._resolve(items, callback)
+            return
+        # Wait first: an encode that already finished reports back inside submit()
+        self._path_waiters.append(({it.id for it in unsaved}, list(items), callback))
+        for item in unsaved:
+            self.ensure_path(item)
+
+    def _with_path(self, item: StationItem, action: Callable[[str], None]) -> None:
+        """Run action on item's file once it has one."""
+        def run(resolved: List[Tuple[StationItem, str]]) -> None:
+            if resolved:
+                action(resolved[0][1])
+        self.with_paths([item], run)
+
+    def _resolve(self, items: List[StationItem], callback: Callable) -> None:
+        resolved = []
+        for item in items:
+            if item.item_type == ItemType.IMAGE_TEMP and not item.path:
+                # Its encode failed; don't queue another one
+                continue
+            p = self.ensure_path(item)
+            if p:
+                resolved.append((item, p))
+        callback(resolved)
+
+    def _settle_waiters(self, item_id: str) -> None:
+        ready = []
+        for waiter in self._path_waiters:
+            waiter[0].discard(item_id)
+            if not waiter[0]:
+                ready.append(waiter)
+        for waiter in ready:
+            self._path_waiters.remove(waiter)
+            self._resolve(waiter[1], waiter[2])
+
+    def prefetch_paths(self, items: List[StationItem]) -> None:
+        """Start encoding unsaved images in the background, e.g. once selected."""
+        for item in items:
+            if item.item_type == ItemType.IMAGE_TEMP and not item.path:
+                img = self.payloads.image(item.id)
+                if img is not None:
+                    self.encoder.submit(item.id, img)
+
+    def _apply_encoded(self, item: StationItem, result: Optional[EncodeResult]) -> None:
+        self.encoder.forget(item.id)
+        if result is None or item.path:
+            return
+        item.path = result.path
+        item.thumbnail_path = result.path
+        item.encode_ms = result.encode_ms
+        item.encoded_bytes = result.encoded_bytes
+        self._materialized(item)
+
+    def _on_image_encoded(self, item_id: str, result: Optional[EncodeResult]) -> None:
+        item = self.model.get(item_id)
+        if item is None:
+            # Removed while encoding: drop its reference, the sweeper does the rest
+            self.encoder.forget(item_id)
+            self.store.release(item_id)
+            return
+        self._apply_encoded(item, result)
+        self._settle_waiters(item_id)
 
-        grid.addWidget(btn_wrap, 0, 2, 2, 1, QtCore.Qt.AlignRight)
+    def _append_item(self, item: StationItem) -> None:
+        self._append_items([item])
+
+    @metrics.timed("shelf.append")
+    def _append_items(self, items: List[StationItem]) -> None:
+        # Files already on the shelf are dropped here, in O(1) each
+        added = self.model.append_items(items)
+        metrics.inc("shelf.items_added", len(added))
+        # In-memory temp items get journaled once they are written out
+        self.session.record_add([it for it in added if it.path])
+        self._watch(added)
+        if any(it.item_type == ItemType.FILE for it in added):
+            self.schedule_duplicate_scan()
+
+    def _watch(self, items: List[StationItem]) -> None:
+        self.watcher.watch_many((it.id, it.path) for it in items if it.path)
+
+    def _on_files_changed(self, item_ids: List[str]) -> None:
+        enriched = []
+        for item_id in item_ids:
+            self.model.set_missing(item_id, not self.watcher.exists(item_id))
+            item = self.model.get(item_id)
+            if item is None:
+                continue
+            seen_before = item.mtime is not None
+            if apply_state(item, self.watcher.state(item_id)):
+                enriched.append(item)
+                if seen_before:
+                    # Edited in place: the thumbnail (or a failed decode) is stale
+                    self.thumbnails.invalidate(item_id)
+                self.model.item_changed(item_id)
+        self.session.record_metadata(enriched)
+
+    def _on_file_moved(self, item_id: str, path: str) -> None:
+        item = self.model.get(item_id)
+        if item is None:
+            return
+        if item.thumbnail_path == item.path:
+            item.thumbnail_path = path
+        if item.item_type == ItemType.FILE:
+            item.display_name = os.path.basename(path)
+        self.model.update_path(item_id, path)
+        self.session.record_update(item)
+
+    def toggle_lock(self, station_item: StationItem) -> None:
+        station_item.is_pinned = not station_item.is_pinned
+        if station_item.is_pinned:
+            # Pinned means "keep it": make sure it survives a restart
+            self.ensure_path(station_item)
+        self.model.item_changed(station_item.id)
+        self.session.record_pin(station_item.id, station_item.is_pinned)
+
+    def _remember_selection(self) -> None:
+        current = self.list.currentIndex().data(ItemRole)
+        self._kept_selection = (
+            [it.id for it in self.list.selected_station_items()],
+            current.id if current is not None else None,
+        )
 
-        grid.setColumnStretch(1, 1)
-        return w
+    def _restore_selection(self) -> None:
+        # Runs after the proxy and the view have handled the reset
+        ids, current_id = self._kept_selection
+        self._kept_selection = ([], None)
+
+        def proxy_row(item_id: str) -> int:
+            row = self.model.row_of(item_id)
+            return self.proxy.mapFromSource(self.model.index(row, 0)).row() if row >= 0 else -1
+
+        selection = QtCore.QItemSelection()
+        first = last = -2
+        for row in sorted(r for r in map(proxy_row, ids) if r >= 0) + [-2]:
+            if row == last + 1:
+                last = row
+                continue
+            if first >= 0:
+                selection.select(self.proxy.index(first, 0), self.proxy.index(last, 0))
+            first = last = row
+
+        sm = self.list.selectionModel()
+        if current_id is not None and proxy_row(current_id) >= 0:
+            sm.setCurrentIndex(self.proxy.index(proxy_row(current_id), 0), QtCore.QItemSelectionModel.NoUpdate)
+        if not selection.isEmpty():
+            sm.select(selection, QtCore.QItemSelectionModel.Select)
 
     # -------- remove / clear --------
     def remove_item(self, station_item: StationItem) -> None:
         """Normal remove: respects lock (locked can't be removed automatically)."""
-        if station_item.is_pinned:
-            return
-        self.force_remove_item(station_item)
+        self.remove_items([station_item])
+
+    def remove_items(self, station_items: List[StationItem]) -> None:
+        self.force_remove_items([s for s in station_items if not s.is_pinned])
 
     def force_remove_item(self, station_item: StationItem) -> None:
         """Manual remove via X button: removes even if locked."""
-        self.items = [x for x in self.items if x.id != station_item.id]
-        for i in range(self.list.count()):
-            it = self.list.item(i)
-            s = it.data(QtCore.Qt.UserRole)
-            if s and s.id == station_item.id:
-                self.list.takeItem(i)
-                break
-
-        if self.list.count() == 0:
+        self.force_remove_items([station_item])
+
+    def force_remove_items(self, station_items: List[StationItem]) -> None:
+        ids = [s.id for s in station_items if self.model.row_of(s.id) >= 0]
+        if not ids:
+            return
+        self.model.remove_items(ids)
+        self.session.record_remove(ids)
+        for item_id in ids:
+            self.thumbnails.cancel(item_id)
+            self.encoder.cancel(item_id)
+            self.payloads.discard(item_id)
+            self.store.release(item_id)
+            self.watcher.unwatch(item_id)
+            # A cancelled encode never reports back
+            self._settle_waiters(item_id)
+        self.schedule_duplicate_scan()
+
+        if self.model.rowCount() == 0:
             self.hide_soft()
 
     def clear_unlocked(self) -> None:
-        to_remove = []
-        for i in range(self.list.count()):
-            it = self.list.item(i)
-            s = it.data(QtCore.Qt.UserRole)
-            if s and not s.is_pinned:
-                to_remove.append(s)
-        for s in to_remove:
-            self.force_remove_item(s)
+        self.remove_items(self.items)
 
     # -------- context menu --------
     def _show_context_menu(self, pos: QtCore.QPoint) -> None:
-        it = self.list.itemAt(pos)
-        if not it:
+        s = self.list.station_item_at(pos)
+        if not s:
             return
-        s: StationItem = it.data(QtCore.Qt.UserRole)
 
         menu = QtWidgets.QMenu(self)
         a_open_loc = menu.addAction("Open file location")
@@ -525,9 +907,9 @@ class ShelfWindow(QtWidgets.QWidget):
 
         action = menu.exec(self.list.mapToGlobal(pos))
         if action == a_open_loc:
-            open_in_explorer_select(s.path)
+            self._with_path(s, open_in_explorer_select)
         elif action == a_copy_path:
-            QtGui.QGuiApplication.clipboard().setText(s.path)
+            self._with_path(s, QtGui.QGuiApplication.clipboard().setText)
         elif action == a_remove:
             if not s.is_pinned:
                 self.force_remove_item(s)
@@ -540,9 +922,7 @@ class ShelfWindow(QtWidgets.QWidget):
         mime = cb.mimeData()
 
         if mime and mime.hasUrls():
-            for url in mime.urls():
-                if url.isLocalFile():
-                    self.add_file(url.toLocalFile())
+            self.ingest_paths([u.toLocalFile() for u in mime.urls() if u.isLocalFile()])
             self.show_soft()
             return
 
@@ -558,24 +938,19 @@ class ShelfWindow(QtWidgets.QWidget):
             self.show_soft()
 
     def export_selection_to_clipboard(self) -> None:
-        selected = self.list.selectedItems()
-        if not selected:
-            return
-        paths = []
-        for it in selected:
-            s: StationItem = it.data(QtCore.Qt.UserRole)
-            if s and os.path.exists(s.path):
-                paths.append(s.path)
-        if not paths:
+        selected = self.list.selected_station_items()
+        if selected:
+            self.with_paths(selected, self._export_to_clipboard)
+
+    @staticmethod
+    def _export_to_clipboard(resolved: List[Tuple[StationItem, str]]) -> None:
+        if not resolved:
             return
         mime = QtCore.QMimeData()
-        mime.setUrls([QtCore.QUrl.fromLocalFile(p) for p in paths])
+        mime.setUrls([QtCore.QUrl.fromLocalFile(p) for _, p in resolved])
         QtGui.QGuiApplication.clipboard().setMimeData(mime)
 
     def preview_selected(self) -> None:
-        selected = self.list.selectedItems()
-        if not selected:
-            return
-        s: StationItem = selected[0].data(QtCore.Qt.UserRole)
-        if s:
-            open_with_default_app(s.path)
+        selected = self.list.selected_station_items()
+        if selected:
+            self._with_path(selected[0], open_with_default_app)
@@ -0,0 +1,133 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from PySide6 import QtCore
+
+from . import metrics
+from .settings import get_appdata_dir
+
+
+class StallDetector(QtCore.QObject):
+    """
+    Watchdog for the GUI event loop.
+
+    A timer on the GUI thread stamps a heartbeat every heartbeat_ms; a
+    watchdog thread checks it just as often. Both default to half the
+    threshold, so an idle app wakes a few times a second rather than every
+    few ms; the cost is that a stall is measured from the last heartbeat and
+    may read up to heartbeat_ms longer than it was.
+
+    Once the loop has been blocked for threshold_ms the main thread's Python
+    stack is written to stalls.log (rotating) in the app data dir, and again
+    each time the stall doubles in length, so a long freeze shows where it
+    was stuck and where it went next. The stall's total duration is logged
+    when the loop comes back.
+    """
+
+    MAX_SAMPLES = 5
+    # A gap this long in the watchdog's own wakeups means the machine slept
+    SUSPEND_GAP_S = 30.0
+
+    def __init__(self, threshold_ms: int = 750, heartbeat_ms: Optional[int] = None,
+                 log_path: Optional[str] = None, max_bytes: int = 1024 * 1024,
+                 backups: int = 3, parent=None) -> None:
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        if heartbeat_ms is None:
+            heartbeat_ms = max(1, threshold_ms // 2)
+        self.period = heartbeat_ms / 1000.0
+        self.stalls = 0
+
+        self._log = logging.getLogger("myfilestation.stalls")
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+        if not self._log.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                log_path or os.path.join(get_appdata_dir(), "stalls.log"),
+                maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._log.addHandler(handler)
+
+        self._main_ident = threading.main_thread().ident
+        self._beat = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.CoarseTimer)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._heartbeat)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._beat = time.monotonic()
+        self._timer.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="mfs-stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._stop.set()
+        self._thread = None
+
+    def _heartbeat(self) -> None:
+        self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        period = self.period
+        prev = time.monotonic()
+        stalled_since: Optional[float] = None
+        next_sample = 0.0
+        samples = 0
+
+        while not self._stop.wait(period):
+            now = time.monotonic()
+            if now - prev > self.SUSPEND_GAP_S:
+                # We didn't get to run either: the machine slept, not the GUI
+                self._beat = now
+                stalled_since = None
+            prev = now
+
+            beat = self._beat
+            blocked = now - beat
+            if stalled_since is not None and beat > stalled_since:
+                # Loop is back
+                total = (beat - stalled_since) * 1000.0
+                self._log.info("stall ended after %.0f ms", total)
+                metrics.observe("gui.stall", total)
+                stalled_since = None
+                continue
+
+            if blocked < self.threshold:
+                continue
+
+            if stalled_since is None:
+                stalled_since = beat
+                samples = 0
+                next_sample = self.threshold
+                self.stalls += 1
+                metrics.inc("gui.stalls")
+
+            if samples < self.MAX_SAMPLES and blocked >= next_sample:
+                samples += 1
+                next_sample *= 2
+                self._log.info(
+                    "GUI thread blocked for %.0f ms (stall #%d, sample %d):\n%s",
+                    blocked * 1000.0, self.stalls, samples, self._main_stack(),
+                )
+
+    def _main_stack(self) -> str:
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return "  <main thread stack unavailable>\n"
+        # Blocked in C++ (e.g. a Qt call) shows as the Python line that called it
+        return "".join(traceback.format_stack(frame))
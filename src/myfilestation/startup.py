@@ -0,0 +1,116 @@
+import os
+import time
+from typing import Dict, List, Optional
+
+from PySide6 import QtCore
+
+from . import metrics
+from .settings import AppSettings, get_appdata_dir
+
+
+class StartupTimer:
+    """
+    Milestones since process start (tray, shelf_built, first_show, ...) in ms.
+
+    report() appends them as one line to startup.log in the app data dir,
+    once per run.
+    """
+
+    def __init__(self, t0: Optional[float] = None) -> None:
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks: Dict[str, float] = {}
+        self._reported = False
+
+    def mark(self, name: str) -> None:
+        # First occurrence wins: that's the one startup latency is about
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.t0) * 1000.0
+            metrics.observe("startup." + name, self.marks[name])
+
+    def summary(self) -> str:
+        return " ".join(f"{k}={v:.0f}ms" for k, v in self.marks.items())
+
+    def report(self) -> None:
+        if self._reported:
+            return
+        self._reported = True
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} {self.summary()}\n"
+        try:
+            with open(os.path.join(get_appdata_dir(), "startup.log"), "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            pass
+
+
+class LazyShelf(QtCore.QObject):
+    """
+    Stands in for ShelfWindow until it is needed.
+
+    The shelf, and everything it imports, is built on first use or by
+    prewarm() once the tray and edge sensor are up, so neither waits on it.
+    Calls that only matter for a visible shelf are dropped while it doesn't
+    exist yet; it picks up the current settings when built.
+    """
+
+    created = QtCore.Signal(object)   # ShelfWindow
+    settings_changed = QtCore.Signal()
+
+    def __init__(self, settings: AppSettings, tracker=None, timer: Optional[StartupTimer] = None,
+                 parent=None) -> None:
+        super().__init__(parent)
+        self.settings = settings
+        self.tracker = tracker
+        self.timer = timer or StartupTimer()
+        self._window = None
+
+    @property
+    def window(self):
+        """The ShelfWindow, or None if it hasn't been built yet."""
+        return self._window
+
+    def get(self):
+        if self._window is None:
+            from .shelf_window import ShelfWindow
+
+            self._window = ShelfWindow(self.settings, self.tracker)
+            self._window.settings_changed.connect(self.settings_changed)
+            self.timer.mark("shelf_built")
+            self.created.emit(self._window)
+        return self._window
+
+    def prewarm(self, delay_ms: int = 0) -> None:
+        # A timer only fires once the event loop is idle, i.e. after the tray is drawn
+        QtCore.QTimer.singleShot(max(0, delay_ms), self.get)
+
+    def show_soft(self) -> None:
+        self.get().show_soft()
+        self._shown()
+
+    def show_from_edge_drag(self) -> None:
+        self.get().show_from_edge_drag()
+        self._shown()
+
+    def add_paths(self, paths: List[str]) -> None:
+        """Paths handed over by another launch or an `add` command."""
+        shelf = self.get()
+        shelf.ingest_paths(paths, expand_folders=self.settings.expand_dropped_folders)
+        shelf.show_soft()
+        self._shown()
+
+    def hide_soft(self) -> None:
+        if self._window is not None:
+            self._window.hide_soft()
+
+    def reposition(self) -> None:
+        if self._window is not None:
+            self._window.reposition()
+
+    def set_duplicate_detection(self, enabled: bool) -> None:
+        if self._window is not None:
+            self._window.set_duplicate_detection(enabled)
+        else:
+            self.settings.detect_duplicate_content = enabled
+
+    def _shown(self) -> None:
+        self.timer.mark("first_show")
+        self.timer.report()
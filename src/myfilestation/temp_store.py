@@ -0,0 +1,216 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Set, Tuple, Union
+
+from PySide6 import QtGui
+
+from .utils import create_temp_image_file_from_qimage, create_temp_text_file, get_temp_dir
+
+
+class _SpilledText:
+    """Large text kept zlib-compressed in a spooled buffer (RAM until it gets big)."""
+
+    def __init__(self, text: str, max_memory: int) -> None:
+        self._buf = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._buf.write(zlib.compress(text.encode("utf-8"), 1))
+
+    def text(self) -> str:
+        self._buf.seek(0)
+        return zlib.decompress(self._buf.read()).decode("utf-8")
+
+    def close(self) -> None:
+        self._buf.close()
+
+
+class TempPayloads:
+    """
+    In-memory payloads of TEXT_TEMP / IMAGE_TEMP items that have no file yet.
+
+    Pasted content stays here until something needs a real path (drag-out,
+    clipboard export, open location). Text above spill_threshold characters
+    is compressed into a spill buffer that only rolls over to an anonymous
+    temp file past max_memory bytes.
+    """
+
+    def __init__(self, spill_threshold: int = 256 * 1024, max_memory: int = 8 * 1024 * 1024) -> None:
+        self.spill_threshold = spill_threshold
+        self.max_memory = max_memory
+        self._payloads: Dict[str, Union[str, _SpilledText, QtGui.QImage]] = {}
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._payloads
+
+    def put_text(self, item_id: str, text: str) -> None:
+        if len(text) > self.spill_threshold:
+            self._payloads[item_id] = _SpilledText(text, self.max_memory)
+        else:
+            self._payloads[item_id] = text
+
+    def put_image(self, item_id: str, qimage: QtGui.QImage) -> None:
+        # QImage is implicitly shared, so this is a cheap reference
+        self._payloads[item_id] = qimage
+
+    def text(self, item_id: str) -> Optional[str]:
+        p = self._payloads.get(item_id)
+        if isinstance(p, _SpilledText):
+            return p.text()
+        return p if isinstance(p, str) else None
+
+    def image(self, item_id: str) -> Optional[QtGui.QImage]:
+        p = self._payloads.get(item_id)
+        return p if isinstance(p, QtGui.QImage) else None
+
+    def discard(self, item_id: str) -> None:
+        p = self._payloads.pop(item_id, None)
+        if isinstance(p, _SpilledText):
+            p.close()
+
+
+class ContentStore:
+    """
+    Content-addressed files for temp items, in get_temp_dir().
+
+    Files are named after a hash of their content (for images: of the pixels
+    plus encoder settings), so pasting the same thing twice reuses one file
+    and names can never collide. Each shelf item holds a reference to its
+    file; the sweeper only ever deletes unreferenced files, oldest first,
+    once they exceed the age or size quota.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        self.directory = directory or get_temp_dir()
+        self._lock = threading.Lock()
+        self._refs: Dict[str, Set[str]] = {}   # path -> item ids
+        self._owner: Dict[str, str] = {}       # item id -> path
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(*parts: bytes) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for p in parts:
+            h.update(p)
+        return h.hexdigest()
+
+    def _acquire_locked(self, item_id: str, path: str) -> None:
+        self._release_locked(item_id)
+        self._refs.setdefault(path, set()).add(item_id)
+        self._owner[item_id] = path
+
+    def _release_locked(self, item_id: str) -> None:
+        path = self._owner.pop(item_id, None)
+        if path is None:
+            return
+        ids = self._refs.get(path)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del self._refs[path]
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        # A dedupe hit counts as a fresh use for the age quota
+        try:
+            os.utime(path, None)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, item_id: str, path: str) -> None:
+        with self._lock:
+            self._acquire_locked(item_id, os.path.normcase(os.path.abspath(path)))
+
+    def release(self, item_id: str) -> None:
+        with self._lock:
+            self._release_locked(item_id)
+
+    def put_text(self, item_id: str, text: str) -> str:
+        data = text.encode("utf-8")
+        name = self._key(b"text:", data) + ".txt"
+        p = os.path.join(self.directory, name)
+        with self._lock:
+            if not self._touch(p):
+                create_temp_text_file(text, name)
+            self._acquire_locked(item_id, os.path.normcase(os.path.abspath(p)))
+        return p
+
+    def put_image(self, item_id: str, qimage: QtGui.QImage, fmt: str, quality: int) -> Tuple[str, bool]:
+        """Returns (path, encoded); encoded is False when an identical file existed."""
+        # QImage.Format is a Python Enum in current PySide6, a Shiboken enum in older ones
+        pixel_format = qimage.format()
+        pixel_format = getattr(pixel_format, "value", pixel_format)
+        header = f"image:{qimage.width()}x{qimage.height()}:{int(pixel_format)}:{fmt}:{quality}:".encode()
+        name = self._key(header, qimage.constBits()) + "." + fmt.lower()
+        p = os.path.join(self.directory, name)
+        key = os.path.normcase(os.path.abspath(p))
+
+        with self._lock:
+            if self._touch(p):
+                self._acquire_locked(item_id, key)
+                return p, False
+            # Hold a reference while encoding so a sweep can't race the write
+            self._acquire_locked(item_id, key)
+
+        if not create_temp_image_file_from_qimage(qimage, fmt, quality, name):
+            self.release(item_id)
+            return "", False
+        return p, True
+
+    # -------- sweeping --------
+    def sweep(self, max_bytes: int, max_age_s: float) -> Tuple[int, int]:
+        """Delete unreferenced files past the quotas; returns (files, bytes) freed."""
+        now = time.time()
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if not e.is_file(follow_symlinks=False):
+                        continue
+                    st = e.stat()
+                    # In-progress writes are left alone
+                    if e.name.endswith(".tmp") and now - st.st_mtime < 3600:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            return 0, 0
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        freed_files = freed_bytes = 0
+
+        for mtime, size, path in entries:
+            if total <= max_bytes and now - mtime < max_age_s:
+                continue
+            with self._lock:
+                # Checked under the lock so a concurrent dedupe hit can't lose its file
+                if os.path.normcase(os.path.abspath(path)) in self._refs:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            total -= size
+            freed_files += 1
+            freed_bytes += size
+
+        return freed_files, freed_bytes
+
+    def start_sweeper(self, interval_s: float, max_bytes: int, max_age_s: float) -> None:
+        if self._sweeper is not None:
+            return
+
+        def run() -> None:
+            while True:
+                self.sweep(max_bytes, max_age_s)
+                if self._stop.wait(interval_s):
+                    return
+
+        self._sweeper = threading.Thread(target=run, name="mfs-temp-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
@@ -0,0 +1,129 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6 import QtGui
+
+
+class ThumbnailCache:
+    """
+    Two-tier thumbnail cache: an in-memory LRU of QImages in front of a
+    directory of small PNGs with a byte quota.
+
+    Entries are keyed by (path, file size, mtime, thumbnail size), so editing
+    the source file naturally invalidates its thumbnail. Safe to call from
+    worker threads.
+    """
+
+    def __init__(self, directory: str, quota_bytes: int, memory_items: int = 512) -> None:
+        self.directory = directory
+        self.quota_bytes = max(0, quota_bytes)
+        self.memory_items = memory_items
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, QtGui.QImage]" = OrderedDict()
+        # key -> file size on disk, oldest first; filled on first use
+        self._disk: Optional["OrderedDict[str, int]"] = None
+        self._disk_bytes = 0
+
+    @staticmethod
+    def make_key(path: str, size: int) -> Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        raw = f"{os.path.normcase(os.path.abspath(path))}|{st.st_size}|{st.st_mtime_ns}|{size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _file_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".png")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        # Called with the lock held. File mtime doubles as the LRU timestamp.
+        if self._disk is not None:
+            return self._disk
+        entries = []
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.is_file() and e.name.endswith(".png"):
+                        st = e.stat()
+                        entries.append((st.st_mtime, e.name[:-4], st.st_size))
+        except OSError:
+            pass
+        entries.sort()
+        self._disk = OrderedDict((key, size) for _, key, size in entries)
+        self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def get(self, key: str) -> Optional[QtGui.QImage]:
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+                return img
+
+            disk = self._load_index()
+            if key not in disk:
+                return None
+            disk.move_to_end(key)
+
+        p = self._file_for(key)
+        img = QtGui.QImage(p)
+        if img.isNull():
+            with self._lock:
+                self._forget_disk(key)
+            return None
+        try:
+            os.utime(p, None)
+        except OSError:
+            pass
+        self._remember(key, img)
+        return img
+
+    def put(self, key: str, img: QtGui.QImage) -> None:
+        self._remember(key, img)
+        if self.quota_bytes <= 0:
+            return
+
+        p = self._file_for(key)
+        tmp = f"{p}.{threading.get_ident()}.tmp"
+        try:
+            if not img.save(tmp, "PNG"):
+                return
+            os.replace(tmp, p)
+            nbytes = os.path.getsize(p)
+        except OSError:
+            return
+
+        with self._lock:
+            disk = self._load_index()
+            self._disk_bytes += nbytes - disk.get(key, 0)
+            disk[key] = nbytes
+            disk.move_to_end(key)
+            self._evict()
+
+    def _remember(self, key: str, img: QtGui.QImage) -> None:
+        with self._lock:
+            self._memory[key] = img
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _forget_disk(self, key: str) -> None:
+        # Called with the lock held
+        if self._disk is not None and key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+
+    def _evict(self) -> None:
+        # Called with the lock held
+        while self._disk and self._disk_bytes > self.quota_bytes:
+            key, nbytes = self._disk.popitem(last=False)
+            self._disk_bytes -= nbytes
+            try:
+                os.remove(self._file_for(key))
+            except OSError:
+                pass
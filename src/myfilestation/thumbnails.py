@@ -0,0 +1,163 @@
+import threading
+from typing import Dict, Optional, Set, Union
+
+from PySide6 import QtCore, QtGui
+
+from . import metrics
+from .thumbnail_cache import ThumbnailCache
+
+
+def decode_thumbnail(path: str, size: int) -> QtGui.QImage:
+    """
+    Decode an image straight at thumbnail size and center-crop it to a square.
+
+    QImageReader.setScaledSize lets JPEG decode at a reduced DCT scale, so a
+    24 MP photo never materializes at full resolution.
+    """
+    reader = QtGui.QImageReader(path)
+    reader.setAutoTransform(True)
+    src = reader.size()
+    if src.isValid() and (src.width() > size or src.height() > size):
+        reader.setScaledSize(src.scaled(size, size, QtCore.Qt.KeepAspectRatioByExpanding))
+
+    return crop_thumbnail(reader.read(), size)
+
+
+def crop_thumbnail(img: QtGui.QImage, size: int) -> QtGui.QImage:
+    """Scale img to cover size x size and center-crop it."""
+    if img.isNull():
+        return img
+
+    if img.width() != size or img.height() != size:
+        img = img.scaled(size, size, QtCore.Qt.KeepAspectRatioByExpanding, QtCore.Qt.SmoothTransformation)
+        x = (img.width() - size) // 2
+        y = (img.height() - size) // 2
+        img = img.copy(x, y, size, size)
+    return img
+
+
+class _JobSignals(QtCore.QObject):
+    done = QtCore.Signal(str, object, object)  # item_id, token, QImage
+
+
+class _ThumbnailJob(QtCore.QRunnable):
+    def __init__(self, signals: _JobSignals, item_id: str, source: Union[str, QtGui.QImage], size: int,
+                 token: threading.Event, cache: Optional[ThumbnailCache]) -> None:
+        super().__init__()
+        self._signals = signals
+        self._cache = cache
+        self._item_id = item_id
+        self._source = source
+        self._size = size
+        self.token = token
+
+    def run(self) -> None:
+        # token is set when the item went away before we got here
+        if self.token.is_set():
+            return
+        if isinstance(self._source, QtGui.QImage):
+            # In-memory image (unsaved paste): nothing worth caching on disk
+            img = crop_thumbnail(self._source, self._size)
+        else:
+            key = self._cache.make_key(self._source, self._size) if self._cache else None
+            img = self._cache.get(key) if key else None
+            if img is None:
+                metrics.inc("thumbs.cache_miss")
+                try:
+                    with metrics.span("thumbs.decode"):
+                        img = decode_thumbnail(self._source, self._size)
+                except Exception:
+                    img = QtGui.QImage()
+                if key and not img.isNull():
+                    self._cache.put(key, img)
+            else:
+                metrics.inc("thumbs.cache_hit")
+        if self.token.is_set():
+            return
+        self._signals.done.emit(self._item_id, self.token, img)
+
+
+class ThumbnailLoader(QtCore.QObject):
+    """
+    Decodes thumbnails on a worker pool and keeps the results in QPixmapCache.
+
+    pixmap() never blocks: on a miss it queues a decode and returns None so the
+    caller can paint a placeholder; thumbnail_ready fires once the row can be
+    repainted.
+    """
+
+    thumbnail_ready = QtCore.Signal(str)  # item_id
+
+    def __init__(self, size: int, cache: Optional[ThumbnailCache] = None, parent=None) -> None:
+        super().__init__(parent)
+        self.size = size
+        self.cache = cache
+
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(max(2, QtCore.QThread.idealThreadCount() // 2))
+
+        self._signals = _JobSignals(self)
+        self._signals.done.connect(self._on_job_done)
+
+        # item_id -> cancellation token of the in-flight job
+        self._pending: Dict[str, threading.Event] = {}
+        self._failed: Set[str] = set()
+        # Thumbnails of items that only exist in memory so far
+        self._image_sources: Dict[str, QtGui.QImage] = {}
+
+    @staticmethod
+    def _cache_key(item_id: str) -> str:
+        return f"mfs_thumb:{item_id}"
+
+    def set_image_source(self, item_id: str, qimage: QtGui.QImage) -> None:
+        """Thumbnail item_id from an in-memory image until it gets a thumbnail path."""
+        self._image_sources[item_id] = qimage
+
+    def drop_image_source(self, item_id: str) -> None:
+        """The item has a file now; let go of the decoded image."""
+        self._image_sources.pop(item_id, None)
+
+    def pixmap(self, item_id: str, path: Optional[str]) -> Optional[QtGui.QPixmap]:
+        pm = QtGui.QPixmapCache.find(self._cache_key(item_id))
+        if pm is not None and not pm.isNull():
+            return pm
+        source = path if path else self._image_sources.get(item_id)
+        if source is not None:
+            self.request(item_id, source)
+        return None
+
+    def request(self, item_id: str, source: Union[str, QtGui.QImage]) -> None:
+        if item_id in self._pending or item_id in self._failed:
+            return
+        token = threading.Event()
+        self._pending[item_id] = token
+        self._pool.start(_ThumbnailJob(self._signals, item_id, source, self.size, token, self.cache))
+
+    def invalidate(self, item_id: str) -> None:
+        """The item's file changed: forget its thumbnail (or failure) and decode again on next paint."""
+        token = self._pending.pop(item_id, None)
+        if token is not None:
+            # Queued jobs see the token and return without decoding
+            token.set()
+        self._failed.discard(item_id)
+        QtGui.QPixmapCache.remove(self._cache_key(item_id))
+
+    def cancel(self, item_id: str) -> None:
+        self.invalidate(item_id)
+        self._image_sources.pop(item_id, None)
+
+    def cancel_all(self) -> None:
+        for item_id in list(self._pending):
+            self.cancel(item_id)
+
+    def _on_job_done(self, item_id: str, token: threading.Event, img: QtGui.QImage) -> None:
+        # Stale result: cancelled, or superseded by a newer request
+        if self._pending.get(item_id) is not token or token.is_set():
+            return
+        del self._pending[item_id]
+
+        if img.isNull():
+            self._failed.add(item_id)
+            return
+        QtGui.QPixmapCache.insert(self._cache_key(item_id), QtGui.QPixmap.fromImage(img))
+        self.thumbnail_ready.emit(item_id)
@@ -1,5 +1,9 @@
+import os
+import time
+
 from PySide6 import QtWidgets
-from .settings import AppSettings, SettingsService
+from . import metrics
+from .settings import AppSettings, SettingsService, get_appdata_dir
 from .utils import set_autostart_windows, get_running_python_exe_for_autostart
 
 
@@ -9,6 +13,7 @@ class TrayController:
         self.sensor = sensor
         self.settings = settings
         self.settings_service = settings_service
+        self.shelf.settings_changed.connect(lambda: self.settings_service.save(self.settings))
 
         # Use a standard icon so tray ALWAYS appears
         icon = QtWidgets.QApplication.style().standardIcon(QtWidgets.QStyle.SP_DirIcon)
@@ -26,10 +31,24 @@ class TrayController:
         act_right = menu.addAction("Dock: Right")
         menu.addSeparator()
 
+        self.act_expand = menu.addAction("Expand dropped folders")
+        self.act_expand.setCheckable(True)
+        self.act_expand.setChecked(self.settings.expand_dropped_folders)
+
+        self.act_dupes = menu.addAction("Flag duplicate content")
+        self.act_dupes.setCheckable(True)
+        self.act_dupes.setChecked(self.settings.detect_duplicate_content)
+
         self.act_autostart = menu.addAction("Auto-start with Windows")
         self.act_autostart.setCheckable(True)
         self.act_autostart.setChecked(self.settings.autostart)
 
+        menu.addSeparator()
+        self.act_metrics = menu.addAction("Collect metrics")
+        self.act_metrics.setCheckable(True)
+        self.act_metrics.setChecked(self.settings.metrics_enabled)
+        act_dump = menu.addAction("Dump metrics")
+
         menu.addSeparator()
         act_exit = menu.addAction("Exit")
 
@@ -39,7 +58,11 @@ class TrayController:
         act_left.triggered.connect(lambda: self._set_dock("left"))
         act_right.triggered.connect(lambda: self._set_dock("right"))
 
+        self.act_expand.toggled.connect(self._toggle_expand)
+        self.act_dupes.toggled.connect(self._toggle_dupes)
         self.act_autostart.toggled.connect(self._toggle_autostart)
+        self.act_metrics.toggled.connect(self._toggle_metrics)
+        act_dump.triggered.connect(self._dump_metrics)
         act_exit.triggered.connect(QtWidgets.QApplication.quit)
 
         self.tray.setContextMenu(menu)
@@ -59,6 +82,31 @@ class TrayController:
         self.shelf.reposition()
         self.sensor.reposition()
 
+    def _toggle_expand(self, enabled: bool) -> None:
+        self.settings.expand_dropped_folders = enabled
+        self.settings_service.save(self.settings)
+
+    def _toggle_dupes(self, enabled: bool) -> None:
+        self.shelf.set_duplicate_detection(enabled)
+        self.settings_service.save(self.settings)
+
+    def _toggle_metrics(self, enabled: bool) -> None:
+        self.settings.metrics_enabled = enabled
+        self.settings_service.save(self.settings)
+        metrics.set_enabled(enabled)
+
+    def _dump_metrics(self) -> None:
+        path = os.path.join(get_appdata_dir(), f"metrics-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            metrics.dump(path)
+        except OSError as e:
+            self.tray.showMessage("MyFileStation", f"Could not write metrics: {e}",
+                                  QtWidgets.QSystemTrayIcon.Warning, 4000)
+            return
+        note = "" if self.settings.metrics_enabled else "\n(Collection is off; enable \"Collect metrics\")"
+        self.tray.showMessage("MyFileStation", f"Metrics written to {path}{note}",
+                              QtWidgets.QSystemTrayIcon.Information, 4000)
+
     def _toggle_autostart(self, enabled: bool) -> None:
         self.settings.autostart = enabled
         self.settings_service.save(self.settings)
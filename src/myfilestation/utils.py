@@ -1,9 +1,11 @@
 import os
 import time
+import threading
 import subprocess
 from typing import Optional
 from pathlib import Path
 
+from . import metrics
 from .settings import get_appdata_dir
 
 
@@ -18,21 +20,33 @@ def is_image_file(path: str) -> bool:
     return ext in [".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"]
 
 
-def create_temp_text_file(text: str) -> str:
-    d = get_temp_dir()
-    name = f"mfs_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000}.txt"
-    p = os.path.join(d, name)
-    with open(p, "w", encoding="utf-8") as f:
+def _default_temp_name(ext: str) -> str:
+    return f"mfs_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000}.{ext}"
+
+
+@metrics.timed("temp.write_text")
+def create_temp_text_file(text: str, name: Optional[str] = None) -> str:
+    # Write under a temporary name first so a half-written file is never visible
+    p = os.path.join(get_temp_dir(), name or _default_temp_name("txt"))
+    tmp = f"{p}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         f.write(text)
+    os.replace(tmp, p)
     return p
 
 
-def create_temp_image_file_from_qimage(qimage) -> str:
-    # Save QImage as PNG
-    d = get_temp_dir()
-    name = f"mfs_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000}.png"
-    p = os.path.join(d, name)
-    qimage.save(p, "PNG")
+@metrics.timed("temp.write_image")
+def create_temp_image_file_from_qimage(qimage, fmt: str = "PNG", quality: int = -1, name: Optional[str] = None) -> str:
+    # Save QImage as PNG (or BMP / WEBP); returns "" if the encoder failed
+    p = os.path.join(get_temp_dir(), name or _default_temp_name(fmt.lower()))
+    tmp = f"{p}.{threading.get_ident()}.tmp"
+    if not qimage.save(tmp, fmt, quality):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return ""
+    os.replace(tmp, p)
     return p
 
 
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6 import QtCore  # noqa: E402
+
+from myfilestation.drag_tracker import DragSessionTracker  # noqa: E402
+from myfilestation.input_sources import ScriptedInputSource  # noqa: E402
+from myfilestation.settings import AppSettings  # noqa: E402
+
+
+@pytest.fixture
+def drag(qapp):
+    settings = AppSettings()
+    settings.drag_delay_ms = 0
+    source = ScriptedInputSource()
+    tracker = DragSessionTracker(settings, source)
+    events = []
+    tracker.drag_ended.connect(lambda pos: events.append("ended"))
+    tracker.drag_cancelled.connect(lambda pos: events.append("cancelled"))
+
+    source.press(100, 100)
+    source.move(200, 100)
+    assert tracker.is_dragging()
+    return source, tracker, events
+
+
+def test_drop_delivered_after_release_ends_the_drag(drag, wait_until):
+    source, tracker, events = drag
+    source.release(200, 100)
+    tracker.mark_dropped()
+    assert events == ["ended"]
+
+    # Nor is it reported as cancelled once the grace period runs out
+    deadline = []
+    QtCore.QTimer.singleShot(tracker.DROP_GRACE_MS * 2, lambda: deadline.append(True))
+    wait_until(lambda: deadline)
+    assert events == ["ended"]
+
+
+def test_release_without_drop_is_cancelled_after_grace(drag, wait_until):
+    source, tracker, events = drag
+    source.release(200, 100)
+    assert events == []
+    wait_until(lambda: events)
+    assert events == ["cancelled"]
+
+
+def test_drop_before_release_ends_the_drag(drag):
+    source, tracker, events = drag
+    tracker.mark_dropped()
+    source.release(200, 100)
+    assert events == ["ended"]
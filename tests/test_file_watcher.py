@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from myfilestation.file_watcher import FileWatcher  # noqa: E402
+from myfilestation.ingest import file_item  # noqa: E402
+from myfilestation.metadata import apply_state  # noqa: E402
+
+
+def test_files_added_after_the_folder_is_listed_get_metadata(qapp, wait_until, tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"a" * 10)
+    (tmp_path / "b.bin").write_bytes(b"b" * 20)
+    a = file_item(str(tmp_path / "a.bin"))
+    b = file_item(str(tmp_path / "b.bin"))
+    items = {a.id: a, b.id: b}
+
+    watcher = FileWatcher()
+
+    def on_changed(item_ids):
+        # As ShelfWindow._on_files_changed does
+        for item_id in item_ids:
+            apply_state(items[item_id], watcher.state(item_id))
+
+    watcher.changed.connect(on_changed)
+    try:
+        watcher.watch(a.id, a.path)
+        wait_until(lambda: a.size is not None)
+
+        # The folder's listing is cached now, so b is answered from it
+        watcher.watch(b.id, b.path)
+        assert b.size == 20
+        assert b.mtime is not None
+        assert a.size == 10
+    finally:
+        watcher.shutdown()
+
+
+def test_large_batches_are_registered_a_chunk_per_event_loop_turn(qapp, wait_until, tmp_path):
+    items = []
+    for i in range(5):
+        (tmp_path / f"f{i}.bin").write_bytes(b"x" * i)
+        items.append(file_item(str(tmp_path / f"f{i}.bin")))
+
+    watcher = FileWatcher()
+    watcher.WATCH_CHUNK = 2
+    reports = []
+    watcher.changed.connect(reports.append)
+    try:
+        watcher.watch(items[0].id, items[0].path)
+        wait_until(lambda: reports)
+        reports.clear()
+
+        watcher.watch_many((it.id, it.path) for it in items[1:])
+        # Only the first chunk was registered before returning
+        assert reports == [[items[1].id, items[2].id]]
+        assert watcher.state(items[3].id) is None
+
+        wait_until(lambda: len(reports) == 2)
+        assert reports[1] == [items[3].id, items[4].id]
+        assert watcher.state(items[4].id).size == 4
+    finally:
+        watcher.shutdown()
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6 import QtGui  # noqa: E402
+
+from myfilestation.image_encoder import ImageEncoder  # noqa: E402
+from myfilestation.settings import AppSettings  # noqa: E402
+from myfilestation.temp_store import ContentStore  # noqa: E402
+
+
+def pasted_image(color) -> QtGui.QImage:
+    img = QtGui.QImage(64, 48, QtGui.QImage.Format_ARGB32)
+    img.fill(QtGui.QColor(color))
+    return img
+
+
+@pytest.fixture
+def encoder(qapp, tmp_path, monkeypatch):
+    # The store writes into get_temp_dir()
+    monkeypatch.setenv("TEMP", str(tmp_path))
+    store = ContentStore()
+    enc = ImageEncoder(AppSettings(), store)
+    yield enc, store
+    enc.shutdown()
+
+
+def test_pasted_image_round_trips_through_the_store(encoder):
+    enc, store = encoder
+    img = pasted_image("#3070c0")
+
+    result = enc.submit("a", img).result(timeout=10)
+
+    assert result is not None
+    assert os.path.dirname(result.path) == store.directory
+    assert result.encoded_bytes == os.path.getsize(result.path)
+    back = QtGui.QImage(result.path)
+    assert back.size() == img.size()
+    assert back.pixelColor(10, 10) == img.pixelColor(10, 10)
+
+
+def test_identical_pastes_share_one_file(encoder):
+    enc, store = encoder
+    first, encoded = store.put_image("a", pasted_image("red"), "PNG", 100)
+    second, encoded_again = store.put_image("b", pasted_image("red"), "PNG", 100)
+    other, _ = store.put_image("c", pasted_image("blue"), "PNG", 100)
+
+    assert encoded and not encoded_again
+    assert first == second
+    assert other != first
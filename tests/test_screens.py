@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6 import QtCore  # noqa: E402
+
+from myfilestation.screens import ScreenInfo, ScreenTable  # noqa: E402
+
+
+def screen(x, y, native_w, native_h, dpr, taskbar=0):
+    # Qt on Windows: top-left in device pixels, size in logical pixels
+    w, h = round(native_w / dpr), round(native_h / dpr)
+    return ScreenInfo(QtCore.QRect(x, y, w, h), QtCore.QRect(x, y, w, h - taskbar))
+
+
+@pytest.fixture
+def desk():
+    # 4K laptop panel at 200% between two 1080p monitors at 100%
+    left = screen(-1920, 0, 1920, 1080, 1.0)
+    laptop = screen(0, 0, 3840, 2160, 2.0, taskbar=40)
+    right = screen(3840, 0, 1920, 1080, 1.0)
+    return left, laptop, right, ScreenTable([laptop, left, right])
+
+
+def test_points_on_a_screen_find_it(desk):
+    left, laptop, right, table = desk
+    assert table.screen_at(QtCore.QPoint(-1, 500)) is left
+    assert table.screen_at(QtCore.QPoint(0, 500)) is laptop
+    assert table.screen_at(QtCore.QPoint(1919, 1079)) is laptop
+    assert table.screen_at(QtCore.QPoint(3840, 0)) is right
+
+
+def test_inner_edges_are_dock_edges(desk):
+    left, laptop, right, table = desk
+    # The laptop's logical right edge is at 1920, not at the right monitor
+    assert table.screen_at(QtCore.QPoint(1915, 300)).edge_distance(1915, "right") == 5
+    assert table.screen_at(QtCore.QPoint(3845, 300)).edge_distance(3845, "left") == 5
+
+
+def test_points_between_scaled_screens_go_to_the_nearest_one(desk):
+    left, laptop, right, table = desk
+    # Mixed DPI leaves logical x 1920..3839 covered by no screen
+    assert table.screen_at(QtCore.QPoint(1925, 300)) is laptop
+    assert table.screen_at(QtCore.QPoint(3835, 300)) is right
+    assert table.screen_at(QtCore.QPoint(100, 1500)) is laptop
+    assert table.screen_at(QtCore.QPoint(-5000, 0)) is left
+
+
+def test_empty_table():
+    assert ScreenTable([]).screen_at(QtCore.QPoint(0, 0)) is None
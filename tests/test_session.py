@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from myfilestation.ingest import file_item  # noqa: E402
+from myfilestation.session import SessionStore  # noqa: E402
+from myfilestation.shelf_model import ShelfItemModel  # noqa: E402
+
+
+def restore(directory, wait_until):
+    store = SessionStore(str(directory))
+    restored = []
+    store.restored.connect(restored.append)
+    store.start()
+    wait_until(lambda: restored)
+    return store, restored[0]
+
+
+def test_sorted_order_survives_a_restart(qapp, wait_until, tmp_path):
+    session_dir = tmp_path / "session"
+    session_dir.mkdir()
+    paths = []
+    for name in ("c.txt", "a.txt", "b.txt"):
+        (tmp_path / name).write_text(name)
+        paths.append(str(tmp_path / name))
+
+    store, items = restore(session_dir, wait_until)
+    assert items == []
+    model = ShelfItemModel([])
+    # As ShelfWindow wires it
+    model.reordered.connect(store.record_reorder)
+    added = model.append_items([file_item(p) for p in paths])
+    store.record_add(added)
+    model.set_sort("name")
+    store.close()
+
+    store, items = restore(session_dir, wait_until)
+    store.close()
+    assert [it.display_name for it in items] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_sort_that_moves_nothing_is_not_journaled(qapp, tmp_path):
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(name)
+    model = ShelfItemModel([])
+    model.append_items([file_item(str(tmp_path / n)) for n in ("a.txt", "b.txt")])
+    orders = []
+    model.reordered.connect(orders.append)
+
+    model.set_sort("name")
+    assert orders == []
+    model.set_sort("name", descending=True)
+    assert len(orders) == 1
+
+
+def test_a_burst_of_sorts_journals_one_order(qapp, wait_until, tmp_path):
+    store, _ = restore(tmp_path, wait_until)
+    store.record_reorder(["a", "b"])
+    store.record_reorder(["b", "a"])
+    store.record_reorder(["a", "b", "c"])
+    store.close()
+
+    with open(tmp_path / "session.journal", encoding="utf-8") as f:
+        ops = [json.loads(line) for line in f]
+    assert [op for op in ops if op["op"] == "reorder"] == [{"op": "reorder", "ids": ["a", "b", "c"]}]
@@ -0,0 +1,35 @@
+import json
+
+from myfilestation.settings import AppSettings, SettingsService
+
+
+def load(tmp_path, monkeypatch, data):
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    service = SettingsService()
+    with open(service._path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    return service.load()
+
+
+def test_null_values_fall_back_to_defaults(tmp_path, monkeypatch):
+    s = load(tmp_path, monkeypatch, {"dock_side": None, "thumbnail_cache_mb": None, "autostart": None})
+    defaults = AppSettings()
+    assert s.dock_side == defaults.dock_side
+    assert s.thumbnail_cache_mb == defaults.thumbnail_cache_mb
+    assert s.autostart == defaults.autostart
+
+
+def test_string_values_are_parsed_for_their_field(tmp_path, monkeypatch):
+    s = load(tmp_path, monkeypatch, {
+        "remove_after_drag_out": "false",
+        "autostart": "1",
+        "thumbnail_cache_mb": "32",
+    })
+    assert s.remove_after_drag_out is False
+    assert s.autostart is True
+    assert s.thumbnail_cache_mb == 32
+
+
+def test_unrecognised_bool_string_keeps_the_default(tmp_path, monkeypatch):
+    s = load(tmp_path, monkeypatch, {"remove_after_drag_out": "maybe"})
+    assert s.remove_after_drag_out is AppSettings().remove_after_drag_out
@@ -0,0 +1,92 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6 import QtCore, QtGui  # noqa: E402
+
+from myfilestation.ingest import file_item  # noqa: E402
+from myfilestation.models import ItemType  # noqa: E402
+from myfilestation.settings import AppSettings  # noqa: E402
+from myfilestation.shelf_model import ItemRole  # noqa: E402
+from myfilestation.shelf_window import ShelfWindow  # noqa: E402
+
+
+@pytest.fixture
+def shelf(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv("APPDATA", str(tmp_path / "appdata"))
+    monkeypatch.setenv("TEMP", str(tmp_path / "temp"))
+    w = ShelfWindow(AppSettings())
+    yield w
+    w.encoder.shutdown()
+    w.session.close()
+    w.deleteLater()
+
+
+@pytest.fixture
+def encoder_busy(shelf):
+    """Holds the encoder's worker thread until the returned event is set."""
+    gate = threading.Event()
+    shelf.encoder._executor.submit(gate.wait, 10)
+    yield gate
+    gate.set()
+
+
+def paste_image(shelf):
+    img = QtGui.QImage(320, 200, QtGui.QImage.Format_RGB32)
+    img.fill(QtGui.QColor("teal"))
+    shelf.add_temp_image(img)
+    item = shelf.items[-1]
+    assert item.item_type == ItemType.IMAGE_TEMP and not item.path
+    return item
+
+
+def test_pasted_image_gets_its_file_off_the_gui_thread(shelf, encoder_busy, wait_until):
+    item = paste_image(shelf)
+    calls = []
+
+    shelf.with_paths([item], calls.append)
+    # Nothing waited on the encode
+    assert calls == []
+    encoder_busy.set()
+
+    wait_until(lambda: calls)
+    assert calls == [[(item, item.path)]]
+    assert os.path.isfile(item.path)
+    # Now it has a file, later requests are answered at once
+    shelf.with_paths([item], calls.append)
+    assert calls[-1] == [(item, item.path)]
+
+
+def test_removing_an_image_while_it_encodes_still_answers(shelf, encoder_busy):
+    item = paste_image(shelf)
+    calls = []
+
+    shelf.with_paths([item], calls.append)
+    shelf.force_remove_items([item])
+    assert calls == [[]]
+
+
+def test_scattered_removal_keeps_the_selection(shelf, tmp_path):
+    paths = []
+    for i in range(40):
+        (tmp_path / f"f{i:02d}.txt").write_text(str(i))
+        paths.append(str(tmp_path / f"f{i:02d}.txt"))
+    shelf._append_items([file_item(p) for p in paths])
+    items = list(shelf.items)
+
+    view, proxy = shelf.list, shelf.proxy
+    sm = view.selectionModel()
+    for row in range(1, 40, 4):
+        sm.select(proxy.index(row, 0), QtCore.QItemSelectionModel.Select)
+    sm.setCurrentIndex(proxy.index(5, 0), QtCore.QItemSelectionModel.NoUpdate)
+    kept = [it.id for it in view.selected_station_items()]
+
+    # 20 separate runs: more than remove_items handles without a reset
+    shelf.force_remove_items(items[0::2])
+
+    assert len(shelf.items) == 20
+    assert [it.id for it in view.selected_station_items()] == kept
+    assert view.currentIndex().data(ItemRole) is items[5]
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6 import QtGui  # noqa: E402
+
+from myfilestation.thumbnails import ThumbnailLoader  # noqa: E402
+
+
+def save_image(path, color):
+    img = QtGui.QImage(40, 40, QtGui.QImage.Format_RGB32)
+    img.fill(QtGui.QColor(color))
+    assert img.save(str(path))
+
+
+def color_of(pm):
+    return pm.toImage().pixelColor(8, 8).name()
+
+
+def thumbnail(loader, item_id, path, wait_until):
+    ready = []
+    loader.thumbnail_ready.connect(ready.append)
+    try:
+        loader.pixmap(item_id, str(path))
+        wait_until(lambda: ready or item_id not in loader._pending)
+    finally:
+        loader.thumbnail_ready.disconnect(ready.append)
+    return loader.pixmap(item_id, str(path))
+
+
+def test_file_edited_in_place_gets_a_new_thumbnail(qapp, wait_until, tmp_path):
+    loader = ThumbnailLoader(16)
+    path = tmp_path / "pic.png"
+    save_image(path, "#ff0000")
+    assert color_of(thumbnail(loader, "a", path, wait_until)) == "#ff0000"
+
+    save_image(path, "#0000ff")
+    # Cached until the watcher reports the change
+    assert color_of(loader.pixmap("a", str(path))) == "#ff0000"
+    loader.invalidate("a")
+    assert color_of(thumbnail(loader, "a", path, wait_until)) == "#0000ff"
+    loader.cancel("a")
+
+
+def test_failed_decode_is_retried_after_a_change(qapp, wait_until, tmp_path):
+    loader = ThumbnailLoader(16)
+    path = tmp_path / "pic.png"
+    path.write_bytes(b"not an image yet")
+    assert thumbnail(loader, "a", path, wait_until) is None
+
+    save_image(path, "#00ff00")
+    # A failure is not retried on its own...
+    assert thumbnail(loader, "a", path, wait_until) is None
+    # ...but is once the file changed
+    loader.invalidate("a")
+    assert color_of(thumbnail(loader, "a", path, wait_until)) == "#00ff00"
+    loader.cancel("a")